@@ -8,6 +8,9 @@ import json
 import zipfile
 import tempfile
 import base64
+import gzip
+import io
+import mimetypes
 from datetime import datetime, timedelta
 from typing import Dict, Any
 from functools import wraps
@@ -50,6 +53,14 @@ cad_renderer = CADRenderer()
 renderer_3d = Renderer3D()
 chart_generator = ChartGenerator()
 
+@app.before_request
+def start_background_tasks():
+    """Start the expiration sweep in whichever process serves requests."""
+    # Started on the first request rather than at import, so it runs in each
+    # server worker: timer threads don't survive a fork, and importing the
+    # app (tools, a gunicorn --preload master) shouldn't start threads
+    user_manager.start_expiration_sweep()
+
 # Create output directory
 OUTPUT_DIR = os.path.join(os.path.dirname(__file__), 'output')
 os.makedirs(OUTPUT_DIR, exist_ok=True)
@@ -137,21 +148,21 @@ def design_interface():
             
             floor_plan_images = []
             
-            # Generate blueprint for each floor
+            # Generate blueprint for each floor, rendered in parallel
             floor_names = ["ground", "first", "second", "third"]
-            for i, floor_plan in enumerate(all_floor_plans):
-                floor_name = floor_names[i] if i < len(floor_names) else f"floor_{i+1}"
-                title = f"Professional Floor Plan - {floor_name.title()} Floor"
-                
-                print(f"DEBUG: Rendering {floor_name} floor with {len(floor_plan.rooms)} rooms")
-                
-                floor_img = cad_renderer.render_floor_plan(
-                    floor_plan, 
-                    title=title,
-                    show_dimensions=True,
-                    show_grid=True
-                )
-                
+            floor_names = [floor_names[i] if i < len(floor_names) else f"floor_{i+1}"
+                           for i in range(len(all_floor_plans))]
+            titles = [f"Professional Floor Plan - {floor_name.title()} Floor" for floor_name in floor_names]
+            
+            print(f"DEBUG: Rendering {len(all_floor_plans)} floors")
+            floor_imgs = cad_renderer.render_floor_plans_batch(
+                all_floor_plans,
+                titles=titles,
+                show_dimensions=True,
+                show_grid=True
+            )
+            
+            for i, (floor_name, floor_img) in enumerate(zip(floor_names, floor_imgs)):
                 floor_plan_images.append({
                     'floor_number': i,
                     'floor_name': floor_name.title() + " Floor",
@@ -237,8 +248,10 @@ def design_interface():
             # Save 3D visualization - Always save something
             render_3d_path = os.path.join(static_project_dir, '3d_visualization.html')
             if render_3d_html:
-                with open(render_3d_path, 'wb') as f:
-                    f.write(base64.b64decode(render_3d_html))
+                # Stored gzipped; the page is mostly JSON mesh data and shrinks
+                # several times over, and serve_output_file sends it as is
+                with open(render_3d_path + '.gz', 'wb') as f:
+                    f.write(gzip.compress(render_3d_html.encode('utf-8'), compresslevel=6))
                 print(f"DEBUG: 3D visualization saved to {render_3d_path}")
             else:
                 # Create a basic 3D unavailable message
@@ -485,6 +498,19 @@ def serve_output_file(filename):
     if not os.path.abspath(file_path).startswith(os.path.abspath(static_output_dir)):
         return "Access denied", 403
     
+    # Pre-compressed copy: send it with Content-Encoding when the client
+    # accepts gzip, otherwise unpack it here
+    gz_path = file_path + '.gz'
+    if os.path.exists(gz_path):
+        mimetype = mimetypes.guess_type(file_path)[0] or 'application/octet-stream'
+        if 'gzip' in request.accept_encodings:
+            response = send_file(gz_path, mimetype=mimetype)
+            response.headers['Content-Encoding'] = 'gzip'
+            response.headers['Vary'] = 'Accept-Encoding'
+            return response
+        with gzip.open(gz_path, 'rb') as f:
+            return send_file(io.BytesIO(f.read()), mimetype=mimetype)
+    
     if os.path.exists(file_path):
         return send_file(file_path)
     else:
@@ -167,7 +167,7 @@ class FloorPlan(BaseModel):
     """2D floor plan data."""
     floor_number: int = Field(..., ge=0, description="Floor number (0 for ground)")
     rooms: Dict[str, RoomDimensions] = Field(..., description="Room dimensions and positions")
-    doors_windows: List[DoorWindow] = Field(default=[], description="Door and window specifications")
+    doors_windows: List[DoorWindow] = Field(default_factory=list, description="Door and window specifications")
     wall_thickness: float = Field(default=0.75, description="Wall thickness in feet (9 inches)")
     total_dimensions: Dict[str, float] = Field(..., description="Overall floor dimensions")
 
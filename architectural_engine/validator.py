@@ -2,9 +2,12 @@
 Design validation module to ensure feasibility and compliance.
 """
 
-from typing import List, NamedTuple
+from typing import FrozenSet, List, NamedTuple
 from .schemas import DesignInput, BuildingType
 
+# Special requirements that need a large plot
+_LARGE_AMENITIES: FrozenSet[str] = frozenset({'swimming pool', 'tennis court'})
+
 class ValidationResult(NamedTuple):
     """Result of design validation."""
     is_valid: bool
@@ -69,7 +72,8 @@ class DesignValidator:
         # Validate special requirements
         if input_data.special_requirements:
             for requirement in input_data.special_requirements:
-                if requirement.lower() in ['swimming pool', 'tennis court'] and input_data.land_size < 2000:
+                req_lower = requirement.lower()
+                if req_lower in _LARGE_AMENITIES and input_data.land_size < 2000:
                     warnings.append(f"Plot may be too small for {requirement}")
         
         is_valid = len(errors) == 0
@@ -2,18 +2,35 @@
 Authentication routes for user signup, login, and session management.
 """
 
-from flask import Blueprint, render_template, request, redirect, url_for, session, flash
+from flask import Blueprint, render_template, request, redirect, url_for, session, flash, make_response, jsonify
 from datetime import datetime, timedelta
 from functools import wraps
+import hashlib
 import re
+import string
 from models.user import user_manager, SubscriptionPlan, SubscriptionStatus
+from auth.tokens import DEFAULT_TOKEN_TTL, tokens_enabled
 
 auth_bp = Blueprint('auth', __name__)
 
+# Character classes for is_valid_email, equivalent to
+# ^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$
+_EMAIL_TLD_CHARS = frozenset(string.ascii_letters)
+_EMAIL_DOMAIN_CHARS = _EMAIL_TLD_CHARS | frozenset(string.digits + '.-')
+_EMAIL_LOCAL_CHARS = _EMAIL_DOMAIN_CHARS | frozenset('_%+')
+
 def is_valid_email(email):
     """Validate email format."""
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.match(pattern, email) is not None
+    # Hand-rolled scan instead of the regex engine: split once on the '@',
+    # then check each part against its character class.
+    local, sep, domain = email.partition('@')
+    if not sep or not local or not _EMAIL_LOCAL_CHARS.issuperset(local):
+        return False
+    if not _EMAIL_DOMAIN_CHARS.issuperset(domain):
+        return False
+    dot = domain.rfind('.')
+    tld = domain[dot + 1:]
+    return dot > 0 and len(tld) >= 2 and _EMAIL_TLD_CHARS.issuperset(tld)
 
 def is_valid_password(password):
     """Validate password strength."""
@@ -106,6 +123,17 @@ def login():
     
     return render_template('auth/login.html')
 
+@auth_bp.route('/token', methods=['POST'])
+def issue_api_token():
+    """Exchange email and password for a short-lived API token."""
+    if not tokens_enabled():
+        return jsonify({'error': 'API tokens are not configured on this server'}), 503
+    data = request.get_json(silent=True) or request.form
+    user = user_manager.authenticate_user(data.get('email', '').strip().lower(), data.get('password', ''))
+    if not user:
+        return jsonify({'error': 'Invalid email or password'}), 401
+    return jsonify({'token': user_manager.issue_token(user.id), 'expires_in': DEFAULT_TOKEN_TTL})
+
 @auth_bp.route('/logout')
 def logout():
     """User logout."""
@@ -155,6 +183,15 @@ def subscription():
     if not user:
         return redirect(url_for('auth.login'))
     
+    # The page only varies with the user's subscription state, so let the
+    # browser revalidate instead of re-rendering when nothing has changed.
+    # Pending flash messages are rendered into the page, so never 304 then.
+    etag = _subscription_etag(user)
+    if '_flashes' not in session and request.if_none_match.contains(etag):
+        response = make_response('', 304)
+        response.set_etag(etag)
+        return response
+    
     # Get all plan features for comparison
     all_plans = {}
     for plan in SubscriptionPlan:
@@ -165,7 +202,22 @@ def subscription():
             'is_current': user.subscription_plan == plan
         }
     
-    return render_template('auth/subscription.html', user=user, plans=all_plans)
+    response = make_response(render_template('auth/subscription.html', user=user, plans=all_plans))
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+def _subscription_etag(user) -> str:
+    """Build an ETag from the user fields shown on the subscription page."""
+    key = '|'.join(str(value) for value in (
+        user.id,
+        user.subscription_plan.value,
+        user.subscription_status.value,
+        user.trial_end_date,
+        user.subscription_end_date,
+        user.designs_created_this_month,
+    ))
+    return hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
 
 @auth_bp.route('/upgrade/<plan_name>')
 def upgrade_plan(plan_name):
@@ -203,8 +255,6 @@ def get_plan_price(plan: SubscriptionPlan) -> dict:
 
 def login_required(f):
     """Decorator to require login for routes."""
-    from functools import wraps
-    
     @wraps(f)
     def decorated_function(*args, **kwargs):
         if 'user_id' not in session:
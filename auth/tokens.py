@@ -0,0 +1,62 @@
+"""
+Signed, short-lived API tokens so repeat requests skip password hashing.
+"""
+
+import hashlib
+import hmac
+import os
+import time
+from typing import Optional
+
+DEFAULT_TOKEN_TTL = 3600  # seconds
+
+def _secret() -> bytes:
+    # Every process that issues or checks tokens (the Flask app, its workers and
+    # the Netlify function) must sign with the same key, so it comes from the
+    # environment. Without it tokens are switched off rather than signed with a
+    # key no other process shares.
+    return os.environ.get('AUTH_TOKEN_SECRET', '').encode()
+
+def tokens_enabled() -> bool:
+    """True if AUTH_TOKEN_SECRET is set, so tokens can be issued and verified."""
+    return bool(_secret())
+
+def _sign(secret: bytes, payload: str) -> str:
+    return hmac.new(secret, payload.encode(), hashlib.sha256).hexdigest()
+
+def issue_token(user_id: str, ttl: int = DEFAULT_TOKEN_TTL) -> str:
+    """Issue a token of the form ``user_id:expiry:signature``.
+    
+    Raises RuntimeError if AUTH_TOKEN_SECRET is not set.
+    """
+    secret = _secret()
+    if not secret:
+        raise RuntimeError("AUTH_TOKEN_SECRET is not set; API tokens are disabled")
+    payload = f"{user_id}:{int(time.time()) + ttl}"
+    return f"{payload}:{_sign(secret, payload)}"
+
+def verify_token(token: str) -> Optional[str]:
+    """Return the user ID for a valid, unexpired token, otherwise None.
+    
+    Every token is invalid while AUTH_TOKEN_SECRET is not set.
+    """
+    secret = _secret()
+    if not secret:
+        return None
+    try:
+        user_id, expiry, signature = token.rsplit(':', 2)
+        if not hmac.compare_digest(_sign(secret, f"{user_id}:{expiry}"), signature):
+            return None
+        if int(expiry) < time.time():
+            return None
+        return user_id
+    except (AttributeError, ValueError):
+        return None
+
+def token_from_headers(headers: dict) -> Optional[str]:
+    """Extract a bearer token from request headers, if present."""
+    value = headers.get('authorization') or headers.get('Authorization') or ''
+    scheme, _, token = value.partition(' ')
+    if scheme.lower() != 'bearer' or not token:
+        return None
+    return token.strip()
@@ -67,10 +67,11 @@ def showcase_enhancements():
     print("\n📁 DEMO FILES GENERATED:")
     demo_dir = current_dir / 'demo_output'
     if demo_dir.exists():
-        for file in demo_dir.iterdir():
-            if file.is_file():
-                size_kb = file.stat().st_size // 1024
-                print(f"   📄 {file.name} ({size_kb}KB)")
+        with os.scandir(demo_dir) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    size_kb = entry.stat().st_size // 1024
+                    print(f"   📄 {entry.name} ({size_kb}KB)")
     
     print("\n🎯 QUALITY STANDARDS ACHIEVED:")
     print("   ✅ Regulatory Compliance - Suitable for building permits")
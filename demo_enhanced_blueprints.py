@@ -4,8 +4,10 @@ Demo script to showcase the enhanced professional blueprint generation capabilit
 This script generates sample designs to demonstrate the industry-ready features.
 """
 
+import base64
 import sys
 import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 # Add current directory to Python path
@@ -33,6 +35,22 @@ def create_sample_design():
     
     return sample_input
 
+def render_floor_blueprint(job):
+    """Render one floor's blueprint in a worker process."""
+    floor_plan, floor_name = job
+    
+    # Generate professional blueprint with enhanced features
+    title = f"Professional Architectural Floor Plan - {floor_name}"
+    
+    # Render with all enhanced features enabled
+    blueprint_image = CADRenderer().render_floor_plan(
+        floor_plan,
+        title=title,
+        show_dimensions=True,
+        show_grid=True
+    )
+    return floor_name, blueprint_image
+
 def generate_demo_blueprints():
     """Generate demonstration blueprints showcasing enhanced features."""
     
@@ -41,7 +59,6 @@ def generate_demo_blueprints():
     
     # Initialize components
     designer = ArchitecturalDesigner()
-    cad_renderer = CADRenderer()
     
     # Create sample design
     print("\n1. Creating sample design...")
@@ -63,31 +80,24 @@ def generate_demo_blueprints():
     # Generate enhanced blueprints for each floor
     floor_names = ["Ground Floor", "First Floor", "Second Floor"]
     
+    jobs = []
     for i, floor_plan in enumerate(all_floor_plans):
         floor_name = floor_names[i] if i < len(floor_names) else f"Floor {i+1}"
-        
         print(f"   Rendering {floor_name}...")
-        
-        # Generate professional blueprint with enhanced features
-        title = f"Professional Architectural Floor Plan - {floor_name}"
-        
-        # Render with all enhanced features enabled
-        blueprint_image = cad_renderer.render_floor_plan(
-            floor_plan,
-            title=title,
-            show_dimensions=True,
-            show_grid=True
-        )
-        
-        # Save to demo directory
-        output_file = demo_dir / f"{floor_name.lower().replace(' ', '_')}_blueprint.png"
-        
-        # Convert base64 to image file
-        import base64
-        with open(output_file, 'wb') as f:
-            f.write(base64.b64decode(blueprint_image))
-        
-        print(f"   OK: Saved: {output_file}")
+        jobs.append((floor_plan, floor_name))
+    
+    # Floors are independent, so render them in parallel processes
+    with ProcessPoolExecutor(max_workers=len(jobs) or 1) as executor:
+        for floor_name, blueprint_image in executor.map(render_floor_blueprint, jobs):
+            # Save to demo directory
+            output_file = demo_dir / f"{floor_name.lower().replace(' ', '_')}_blueprint.png"
+            
+            # Convert base64 to image file
+            if isinstance(blueprint_image, str):
+                blueprint_image = blueprint_image.encode('ascii')
+            output_file.write_bytes(base64.b64decode(blueprint_image))
+            
+            print(f"   OK: Saved: {output_file}")
     
     # Generate summary report
     print(f"\n4. Creating demonstration summary...")
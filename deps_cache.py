@@ -0,0 +1,33 @@
+"""
+Dependency-check cache shared by the startup scripts.
+
+Each launcher records, under its own name, the requirements.txt fingerprint its
+dependency check last passed for, so later starts can skip the check until
+requirements.txt changes.
+"""
+
+import json
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent
+DEPS_CACHE = BASE_DIR / '.deps_check.json'
+
+def _deps_fingerprint():
+    requirements = BASE_DIR / 'requirements.txt'
+    return str(requirements.stat().st_mtime_ns) if requirements.exists() else 'fixed_v1'
+
+def _load_deps_cache():
+    try:
+        return json.loads(DEPS_CACHE.read_text())
+    except (OSError, ValueError):
+        return {}
+
+def deps_verified(name):
+    """True if the named script's dependencies were verified against the current requirements."""
+    return _load_deps_cache().get(name) == _deps_fingerprint()
+
+def mark_deps_verified(name):
+    """Record that the named script's dependencies passed against the current requirements."""
+    cache = _load_deps_cache()
+    cache[name] = _deps_fingerprint()
+    DEPS_CACHE.write_text(json.dumps(cache))
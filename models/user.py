@@ -3,16 +3,23 @@ User authentication and subscription models for the Architectural Design System.
 """
 
 from datetime import datetime, timedelta
-from typing import Optional, List
-from pydantic import BaseModel, Field
+from typing import Optional, List, Dict
+from pydantic import BaseModel, Field, TypeAdapter
 from typing import Union
 from enum import Enum
+import atexit
+import base64
 import hashlib
-import secrets
-import json
+import hmac
 import os
+import threading
 from pathlib import Path
 
+import numpy as np
+import orjson
+
+from auth import tokens
+
 class SubscriptionPlan(str, Enum):
     """Subscription plan types."""
     BASIC = "basic"
@@ -64,14 +71,85 @@ class User(BaseModel):
     total_designs_created: int = Field(default=0, description="Total designs created")
     saved_designs: List[str] = Field(default=[], description="List of saved design IDs")
 
+_USERS_ADAPTER = TypeAdapter(Dict[str, User])
+
+class _EntropyPool:
+    """Hands out slices of a buffer filled from os.urandom in large blocks."""
+    
+    def __init__(self, size: int = 4096):
+        self.size = size
+        self._reset()
+        # A forked child must never reuse bytes the parent may also hand out
+        os.register_at_fork(after_in_child=self._reset)
+    
+    def _reset(self):
+        self._lock = threading.Lock()
+        self._refill()
+    
+    def _refill(self):
+        self._buffer = os.urandom(self.size)
+        self._offset = 0
+    
+    def take(self, n: int) -> bytes:
+        """Return n fresh random bytes."""
+        with self._lock:
+            if self._offset + n > self.size:
+                self._refill()
+            chunk = self._buffer[self._offset:self._offset + n]
+            self._offset += n
+            return chunk
+
+_entropy = _EntropyPool()
+
+# Small integer codes for the plan/status columns kept by UserManager
+_PLAN_CODES = {plan: code for code, plan in enumerate(SubscriptionPlan)}
+_STATUS_CODES = {status: code for code, status in enumerate(SubscriptionStatus)}
+
+# One bit per boolean PlanFeatures flag, for the mask checks in can_user_access_feature
+_FEATURE_BITS = {
+    name: 1 << bit
+    for bit, name in enumerate(name for name, field in PlanFeatures.model_fields.items() if field.annotation is bool)
+}
+
+# User fields stored as ISO-8601 strings in users.json and the journal
+_DT_FIELDS = ('created_at', 'last_login', 'subscription_start_date', 'subscription_end_date', 'trial_end_date')
+
+def _user_from_record(data: dict) -> User:
+    """Build a User from a stored JSON record without running validation."""
+    for field in _DT_FIELDS:
+        value = data.get(field)
+        if isinstance(value, str):
+            data[field] = datetime.fromisoformat(value)
+    if 'subscription_plan' in data:
+        data['subscription_plan'] = SubscriptionPlan(data['subscription_plan'])
+    if 'subscription_status' in data:
+        data['subscription_status'] = SubscriptionStatus(data['subscription_status'])
+    return User.model_construct(**data)
+
 class UserManager:
     """User management system for authentication and subscription handling."""
     
+    # Journal entries written before users.json is rewritten and the journal truncated
+    COMPACT_EVERY = 500
+    # Seconds last-login updates are held before being journaled together
+    LOGIN_FLUSH_DELAY = 5.0
+    
     def __init__(self, data_dir: str = "data"):
         """Initialize user manager with data directory."""
         self.data_dir = Path(data_dir)
         self.users_file = self.data_dir / "users.json"
+        self.journal_file = self.data_dir / "users.log"
         self.data_dir.mkdir(exist_ok=True)
+        self._journal_lock = threading.Lock()
+        self._journal_events = 0
+        # IDs of users whose last_login changed since the last flush
+        self._pending_logins = set()
+        self._flush_lock = threading.Lock()
+        self._flush_timer = None
+        # PID of the process whose expiration sweep is running; a forked
+        # child inherits the value but not the timer thread
+        self._sweep_pid = None
+        self._sweep_lock = threading.Lock()
         
         # Initialize plan features
         self.plan_features = {
@@ -116,48 +194,162 @@ class UserManager:
             )
         }
         
+        # Keyed by the raw plan string so lookups skip enum hashing
+        self._plan_features_by_value = {plan.value: features for plan, features in self.plan_features.items()}
+        # Plan value -> OR of the _FEATURE_BITS the plan grants
+        self._feature_masks = {
+            plan.value: sum(bit for name, bit in _FEATURE_BITS.items() if getattr(features, name))
+            for plan, features in self.plan_features.items()
+        }
+        
         # Load existing users
         self.users = self._load_users()
+        # Lowercased email -> user ID, kept in step with self.users
+        self._email_index = {user.email.lower(): uid for uid, user in self.users.items()}
+        # Column-per-field copy of the users for vectorized bulk queries
+        self._build_columns()
+        
+        # Mutations are appended here; users.json is only rewritten on compaction
+        self._journal = open(self.journal_file, 'ab', buffering=0)
+        atexit.register(self.compact)
+        # atexit runs handlers last-in first-out, so pending logins are journaled first
+        atexit.register(self._flush_logins)
     
     def _load_users(self) -> dict:
-        """Load users from JSON file."""
-        if self.users_file.exists():
-            try:
-                with open(self.users_file, 'r') as f:
-                    users_data = json.load(f)
-                    return {uid: User(**user_data) for uid, user_data in users_data.items()}
-            except Exception as e:
-                print(f"Error loading users: {e}")
-                return {}
-        return {}
+        """Load users from JSON file and replay the change journal on top."""
+        try:
+            users_data = {}
+            if self.users_file.exists():
+                users_data = orjson.loads(self.users_file.read_bytes())
+            self._replay_journal(users_data)
+            # Records were written by us, so skip pydantic validation
+            return {uid: _user_from_record(user_data) for uid, user_data in users_data.items()}
+        except Exception as e:
+            print(f"Error loading users: {e}")
+            return {}
     
-    def _save_users(self):
-        """Save users to JSON file."""
+    def _replay_journal(self, users_data: dict):
+        """Apply journaled changes to raw user records loaded from users.json."""
+        if not self.journal_file.exists():
+            return
+        with open(self.journal_file, 'rb') as f:
+            for line in f:
+                try:
+                    entry = orjson.loads(line)
+                except ValueError:
+                    # Torn final line from a crash mid-write
+                    continue
+                users_data.setdefault(entry['id'], {}).update(entry['fields'])
+                self._journal_events += 1
+    
+    def _record(self, user: User, *fields: str):
+        """Append a user change to the journal; all fields when none are given."""
+        values = {field: getattr(user, field) for field in (fields or User.model_fields)}
+        # orjson encodes datetimes as ISO-8601 and enums as their values natively
+        entry = orjson.dumps({"op": "update" if fields else "create", "id": user.id, "fields": values})
+        with self._journal_lock:
+            self._sync_row(user)
+            self._journal.write(entry + b"\n")
+            self._journal_events += 1
+            if self._journal_events >= self.COMPACT_EVERY:
+                self._compact_locked()
+    
+    def _build_columns(self):
+        """Build NumPy columns mirroring self.users; _record keeps them in step."""
+        capacity = max(16, len(self.users))
+        self._row_ids: List[str] = []
+        self._id_to_row: Dict[str, int] = {}
+        self._col_plan = np.zeros(capacity, dtype=np.uint8)
+        self._col_status = np.zeros(capacity, dtype=np.uint8)
+        self._col_designs = np.zeros(capacity, dtype=np.int32)
+        self._col_period_end = np.full(capacity, np.datetime64('NaT'), dtype='datetime64[us]')
+        for user in self.users.values():
+            self._sync_row(user)
+    
+    def _sync_row(self, user: User):
+        """Copy a user's fields into its column row, appending a row if new."""
+        row = self._id_to_row.get(user.id)
+        if row is None:
+            row = len(self._row_ids)
+            if row == len(self._col_plan):
+                # Amortized doubling
+                self._col_plan = np.concatenate([self._col_plan, np.zeros_like(self._col_plan)])
+                self._col_status = np.concatenate([self._col_status, np.zeros_like(self._col_status)])
+                self._col_designs = np.concatenate([self._col_designs, np.zeros_like(self._col_designs)])
+                self._col_period_end = np.concatenate(
+                    [self._col_period_end, np.full_like(self._col_period_end, np.datetime64('NaT'))])
+            self._row_ids.append(user.id)
+            self._id_to_row[user.id] = row
+        self._col_plan[row] = _PLAN_CODES[user.subscription_plan]
+        self._col_status[row] = _STATUS_CODES[user.subscription_status]
+        self._col_designs[row] = user.designs_created_this_month
+        period_end = self._period_end(user)
+        self._col_period_end[row] = period_end if period_end else np.datetime64('NaT')
+    
+    def count_users(self, plan: Optional[SubscriptionPlan] = None,
+                    status: Optional[SubscriptionStatus] = None) -> int:
+        """Count users, optionally filtered by plan and/or status."""
+        n = len(self._row_ids)
+        mask = np.ones(n, dtype=bool)
+        if plan is not None:
+            mask &= self._col_plan[:n] == _PLAN_CODES[plan]
+        if status is not None:
+            mask &= self._col_status[:n] == _STATUS_CODES[status]
+        return int(mask.sum())
+    
+    def total_designs_this_month(self) -> int:
+        """Total designs created this month across all users."""
+        return int(self._col_designs[:len(self._row_ids)].sum())
+    
+    def compact(self):
+        """Rewrite users.json from memory and truncate the journal."""
+        with self._journal_lock:
+            self._compact_locked()
+    
+    def _compact_locked(self):
+        # Journal entries carry absolute values, so a crash between the snapshot
+        # and the truncate just replays them onto an already up-to-date file.
+        if self._save_users():
+            self._journal.close()
+            self._journal = open(self.journal_file, 'wb', buffering=0)
+            self._journal_events = 0
+            # The snapshot already holds any last_login still waiting to flush
+            with self._flush_lock:
+                self._pending_logins.clear()
+    
+    def _save_users(self) -> bool:
+        """Atomically save users to JSON file."""
         try:
-            users_data = {uid: user.dict() for uid, user in self.users.items()}
-            # Convert datetime objects to ISO format strings
-            for user_data in users_data.values():
-                for field in ['created_at', 'last_login', 'subscription_start_date', 'subscription_end_date', 'trial_end_date']:
-                    if user_data.get(field):
-                        if isinstance(user_data[field], datetime):
-                            user_data[field] = user_data[field].isoformat()
-            
-            with open(self.users_file, 'w') as f:
-                json.dump(users_data, f, indent=2, default=str)
+            # pydantic-core serializes the whole mapping, datetimes included, in one pass
+            payload = _USERS_ADAPTER.dump_json(self.users, indent=2)
+            tmp_file = self.users_file.with_suffix('.json.tmp')
+            with open(tmp_file, 'wb') as f:
+                f.write(payload)
+                f.flush()
+                # Make sure the data is on disk before the rename can be
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.users_file)
+            return True
         except Exception as e:
             print(f"Error saving users: {e}")
+            return False
     
     def _hash_password(self, password: str) -> str:
         """Hash password using SHA-256 with salt."""
-        salt = secrets.token_hex(16)
-        password_hash = hashlib.sha256((password + salt).encode()).hexdigest()
-        return f"{salt}:{password_hash}"
+        salt = _entropy.take(16)
+        password_hash = hashlib.sha256(salt + password.encode()).digest()
+        return f"{salt.hex()}:{password_hash.hex()}"
     
     def _verify_password(self, password: str, password_hash: str) -> bool:
         """Verify password against hash."""
         try:
             salt, hash_value = password_hash.split(':')
-            return hashlib.sha256((password + salt).encode()).hexdigest() == hash_value
+            expected = bytes.fromhex(hash_value)
+            if hmac.compare_digest(hashlib.sha256(bytes.fromhex(salt) + password.encode()).digest(), expected):
+                return True
+            # Hashes written before the switch to raw salt bytes hashed the
+            # password followed by the hex salt string
+            return hmac.compare_digest(hashlib.sha256((password + salt).encode()).digest(), expected)
         except:
             return False
     
@@ -168,7 +360,7 @@ class UserManager:
             return None
         
         # Generate user ID
-        user_id = secrets.token_urlsafe(16)
+        user_id = base64.urlsafe_b64encode(_entropy.take(16)).rstrip(b'=').decode('ascii')
         
         # Create user with trial period
         trial_end = datetime.now() + timedelta(days=14)  # 14-day trial
@@ -183,30 +375,54 @@ class UserManager:
         )
         
         self.users[user_id] = user
-        self._save_users()
+        self._email_index[email.lower()] = user_id
+        self._record(user)
         return user
     
     def authenticate_user(self, email: str, password: str) -> Optional[User]:
         """Authenticate user with email and password."""
         user = self.get_user_by_email(email)
         if user and self._verify_password(password, user.password_hash):
-            # Update last login
+            # Update last login; journaled in batches by _flush_logins
             user.last_login = datetime.now()
-            self._save_users()
+            with self._flush_lock:
+                self._pending_logins.add(user.id)
+                if self._flush_timer is None:
+                    self._flush_timer = threading.Timer(self.LOGIN_FLUSH_DELAY, self._flush_logins)
+                    self._flush_timer.daemon = True
+                    self._flush_timer.start()
             return user
         return None
     
+    def _flush_logins(self):
+        """Journal the last_login of every user who logged in since the last flush."""
+        with self._flush_lock:
+            pending, self._pending_logins = self._pending_logins, set()
+            self._flush_timer = None
+        for user_id in pending:
+            user = self.users.get(user_id)
+            if user:
+                self._record(user, 'last_login')
+    
     def get_user_by_email(self, email: str) -> Optional[User]:
         """Get user by email address."""
-        for user in self.users.values():
-            if user.email.lower() == email.lower():
-                return user
-        return None
+        user_id = self._email_index.get(email.lower())
+        return self.users.get(user_id) if user_id else None
     
     def get_user_by_id(self, user_id: str) -> Optional[User]:
         """Get user by ID."""
         return self.users.get(user_id)
     
+    def issue_token(self, user_id: str, ttl: int = tokens.DEFAULT_TOKEN_TTL) -> str:
+        """Issue a signed API token so later requests skip password hashing."""
+        return tokens.issue_token(user_id, ttl)
+    
+    def verify_token(self, token: str) -> Optional[User]:
+        """Resolve an API token to its active user, or None if invalid."""
+        user_id = tokens.verify_token(token)
+        user = self.users.get(user_id) if user_id else None
+        return user if user and user.is_active else None
+    
     def update_subscription(self, user_id: str, plan: SubscriptionPlan, duration_months: int = 1) -> bool:
         """Update user subscription plan."""
         user = self.get_user_by_id(user_id)
@@ -218,35 +434,82 @@ class UserManager:
         user.subscription_start_date = datetime.now()
         user.subscription_end_date = datetime.now() + timedelta(days=30 * duration_months)
         
-        self._save_users()
+        self._record(user, 'subscription_plan', 'subscription_status',
+                     'subscription_start_date', 'subscription_end_date')
         return True
     
     def get_plan_features(self, plan: SubscriptionPlan) -> PlanFeatures:
         """Get features for a subscription plan."""
-        return self.plan_features[plan]
+        return self._plan_features_by_value[getattr(plan, 'value', plan)]
     
     def can_user_access_feature(self, user: User, feature: str) -> bool:
         """Check if user can access a specific feature."""
         if not user.is_active:
             return False
         
-        # Check if subscription is active or in trial
-        now = datetime.now()
+        # Check if subscription is active or in trial. The periodic sweep
+        # persists most expiries; this catches anything since the last sweep.
+        end_date = self._period_end(user)
+        if end_date and datetime.now() > end_date:
+            self._expire(user)
+        
+        plan = getattr(user.subscription_plan, 'value', user.subscription_plan)
+        bit = _FEATURE_BITS.get(feature)
+        if bit is None:
+            return getattr(self._plan_features_by_value[plan], feature, False)
+        return bool(self._feature_masks[plan] & bit)
+    
+    @staticmethod
+    def _period_end(user: User) -> Optional[datetime]:
+        """End of the user's current trial or paid period, if it can lapse."""
         if user.subscription_status == SubscriptionStatus.TRIAL:
-            if user.trial_end_date and now > user.trial_end_date:
-                # Trial expired, downgrade to basic
-                user.subscription_status = SubscriptionStatus.EXPIRED
-                user.subscription_plan = SubscriptionPlan.BASIC
-                self._save_users()
-        elif user.subscription_status == SubscriptionStatus.ACTIVE:
-            if user.subscription_end_date and now > user.subscription_end_date:
-                # Subscription expired
-                user.subscription_status = SubscriptionStatus.EXPIRED
-                user.subscription_plan = SubscriptionPlan.BASIC
-                self._save_users()
+            return user.trial_end_date
+        if user.subscription_status == SubscriptionStatus.ACTIVE:
+            return user.subscription_end_date
+        return None
+    
+    def _expire(self, user: User):
+        """Downgrade a user whose trial or subscription has lapsed."""
+        user.subscription_status = SubscriptionStatus.EXPIRED
+        user.subscription_plan = SubscriptionPlan.BASIC
+        self._record(user, 'subscription_status', 'subscription_plan')
+    
+    def sweep_expirations(self) -> int:
+        """Expire every lapsed trial and subscription; returns how many."""
+        # Users without a lapsing period hold NaT, which never compares as expired
+        n = len(self._row_ids)
+        expired = np.flatnonzero(self._col_period_end[:n] < np.datetime64(datetime.now(), 'us'))
+        for row in expired:
+            self._expire(self.users[self._row_ids[row]])
+        return len(expired)
+    
+    def start_expiration_sweep(self, interval: float = 300.0):
+        """
+        Run sweep_expirations every interval seconds on a daemon timer.
         
-        features = self.get_plan_features(user.subscription_plan)
-        return getattr(features, feature, False)
+        Safe to call repeatedly: the sweep starts once per process, including
+        once in each process forked after it started.
+        """
+        if self._sweep_pid == os.getpid():
+            return
+        with self._sweep_lock:
+            if self._sweep_pid == os.getpid():
+                return
+            self._sweep_pid = os.getpid()
+        self._arm_expiration_sweep(interval)
+    
+    def _arm_expiration_sweep(self, interval: float):
+        """Schedule the next sweep; each run re-arms the timer."""
+        def run():
+            try:
+                self.sweep_expirations()
+            except Exception as e:
+                print(f"Error sweeping expirations: {e}")
+            self._arm_expiration_sweep(interval)
+        
+        timer = threading.Timer(interval, run)
+        timer.daemon = True
+        timer.start()
     
     def increment_design_count(self, user_id: str) -> bool:
         """Increment user's design count for the month."""
@@ -256,7 +519,7 @@ class UserManager:
         
         user.designs_created_this_month += 1
         user.total_designs_created += 1
-        self._save_users()
+        self._record(user, 'designs_created_this_month', 'total_designs_created')
         return True
     
     def can_create_design(self, user: User) -> bool:
@@ -0,0 +1,50 @@
+## netlify-python
+import functools
+import orjson
+from auth.tokens import token_from_headers, verify_token
+
+@functools.cache
+def _designer():
+    # Built once per container, on the first valid request, and shared by every operation
+    from architectural_engine.designer import ArchitecturalDesigner
+    return ArchitecturalDesigner()
+
+def _generate_design(input_data):
+    return _designer().generate_design(input_data)
+
+def _generate_floor_plan(design_data):
+    designer = _designer()
+    design = designer.load_design_json(design_data)
+    return designer.generate_floor_plan(design)
+
+OPERATIONS = {
+    'generate_design': _generate_design,
+    'generate_floor_plan': _generate_floor_plan,
+}
+
+def _response(status_code, payload):
+    return {
+        "statusCode": status_code,
+        "headers": {"Content-Type": "application/json"},
+        "body": orjson.dumps(payload).decode()
+    }
+
+def handler(event, context):
+    # Callers that present a token must present a valid one; checking the
+    # HMAC is far cheaper than building the designer for a rejected request.
+    # Requests without a token are handled as before.
+    token = token_from_headers(event.get('headers') or {})
+    if token is not None and verify_token(token) is None:
+        return _response(401, {"error": "Invalid or expired token"})
+    
+    # Operation comes from ?op= or the last path segment (/api/generate_design)
+    op = (event.get('queryStringParameters') or {}).get('op') or event.get('path', '').rstrip('/').rsplit('/', 1)[-1]
+    operation = OPERATIONS.get(op)
+    if operation is None:
+        return _response(404, {"error": f"Unknown operation: {op}"})
+    
+    try:
+        result = operation(orjson.loads(event['body']))
+        return _response(200, result.dict())
+    except Exception as e:
+        return _response(400, {"error": str(e)})
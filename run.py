@@ -7,13 +7,15 @@ This script handles initialization, dependency checking, and app startup.
 import sys
 import os
 import subprocess
-import importlib
+import importlib.util
 from pathlib import Path
 
 # Add the current directory to Python path
 current_dir = Path(__file__).parent
 sys.path.insert(0, str(current_dir))
 
+from deps_cache import deps_verified, mark_deps_verified
+
 def check_python_version():
     """Check if Python version is compatible."""
     if sys.version_info < (3, 8):
@@ -24,25 +26,27 @@ def check_python_version():
 
 def check_dependencies():
     """Check if all required dependencies are installed."""
-    required_packages = [
-        'flask',
-        'numpy',
-        'pandas',
-        'matplotlib',
-        'seaborn',
-        'pydantic',
-        'pillow'
-    ]
+    core_packages = ['flask', 'numpy', 'pydantic']
+    heavy_packages = ['pandas', 'matplotlib', 'seaborn', 'pillow']
+    
+    # Distribution names whose import name differs
+    module_names = {'pillow': 'PIL'}
+    
+    # Heavy packages are checked until a check passes against the current
+    # requirements.txt, then only with --full-check
+    required_packages = list(core_packages)
+    if '--full-check' in sys.argv or not deps_verified('run'):
+        required_packages += heavy_packages
     
     missing_packages = []
     
+    # find_spec only locates the module; importing it would run its top-level code
     for package in required_packages:
-        try:
-            importlib.import_module(package)
-            print(f"OK: {package}")
-        except ImportError:
+        if importlib.util.find_spec(module_names.get(package, package)) is None:
             missing_packages.append(package)
             print(f"MISSING: {package}")
+        else:
+            print(f"OK: {package}")
     
     if missing_packages:
         print(f"\nWARNING: Missing packages: {', '.join(missing_packages)}")
@@ -57,6 +61,8 @@ def check_dependencies():
             print("ERROR: Failed to install packages. Please run manually:")
             print(f"pip install {' '.join(missing_packages)}")
             sys.exit(1)
+    
+    mark_deps_verified('run')
 
 def setup_directories():
     """Create necessary directories."""
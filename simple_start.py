@@ -5,102 +5,283 @@ Simple startup script that runs with existing packages.
 
 import sys
 import os
+import functools
+import hashlib
+import threading
+from importlib.metadata import distribution, PackageNotFoundError
 from pathlib import Path
 
+from deps_cache import deps_verified, mark_deps_verified
+
+# Shared document head for the basic-mode pages
+_HEAD = '''<!DOCTYPE html>
+<html>
+<head>
+    <title>{title}</title>
+    <meta name="viewport" content="width=device-width, initial-scale=1">
+    <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css" rel="stylesheet">
+</head>
+'''
+
+# Pages served by the basic-mode app from create_minimal_app
+HOME_HTML = _HEAD.format(title='Architectural Design System') + '''
+<body>
+    <div class="container mt-5">
+        <div class="row justify-content-center">
+            <div class="col-md-8 text-center">
+                <h1 class="display-4 mb-4">Architectural Design System</h1>
+                <p class="lead mb-4">AI-Powered Residential Design Generator</p>
+
+                <div class="alert alert-info">
+                    <h5>System Status: Basic Mode</h5>
+                    <p>The system is running in basic mode. Some advanced features may be limited due to missing dependencies.</p>
+                </div>
+
+                <div class="row mt-5">
+                    <div class="col-md-4 mb-3">
+                        <div class="card h-100">
+                            <div class="card-body">
+                                <h5 class="card-title">Design Engine</h5>
+                                <p class="card-text">Core architectural calculations and room allocation algorithms.</p>
+                                <span class="badge bg-success">Available</span>
+                            </div>
+                        </div>
+                    </div>
+
+                    <div class="col-md-4 mb-3">
+                        <div class="card h-100">
+                            <div class="card-body">
+                                <h5 class="card-title">Visualizations</h5>
+                                <p class="card-text">2D floor plans and analytical charts.</p>
+                                <span class="badge bg-warning">Limited</span>
+                            </div>
+                        </div>
+                    </div>
+
+                    <div class="col-md-4 mb-3">
+                        <div class="card h-100">
+                            <div class="card-body">
+                                <h5 class="card-title">Analytics</h5>
+                                <p class="card-text">Space efficiency and optimization reports.</p>
+                                <span class="badge bg-success">Available</span>
+                            </div>
+                        </div>
+                    </div>
+                </div>
+
+                <div class="mt-4">
+                    <a href="/test" class="btn btn-primary btn-lg me-3">Test Core System</a>
+                    <a href="/demo" class="btn btn-outline-secondary btn-lg">View Demo Data</a>
+                </div>
+
+                <div class="mt-5">
+                    <h5>To enable full functionality:</h5>
+                    <code>pip install matplotlib numpy pandas seaborn pydantic</code>
+                </div>
+            </div>
+        </div>
+    </div>
+</body>
+</html>
+'''
+
+TEST_TMPL = _HEAD.format(title='System Test - Architectural Design System') + '''
+<body>
+    <div class="container mt-5">
+        <h2>Core System Test Results</h2>
+
+        <div class="row mt-4">
+            <div class="col-md-6">
+                <div class="card">
+                    <div class="card-header bg-success text-white">
+                        <h5>Input Parameters</h5>
+                    </div>
+                    <div class="card-body">
+                        <p><strong>Land Size:</strong> {{ test_data.land_size }} sq.ft</p>
+                        <p><strong>Facing:</strong> {{ test_data.facing }}</p>
+                        <p><strong>Type:</strong> {{ test_data.building_type }}</p>
+                        <p><strong>Configuration:</strong> {{ test_data.bedroom_config }}</p>
+                    </div>
+                </div>
+            </div>
+
+            <div class="col-md-6">
+                <div class="card">
+                    <div class="card-header bg-primary text-white">
+                        <h5>Calculated Results</h5>
+                    </div>
+                    <div class="card-body">
+                        <p><strong>FAR:</strong> {{ far_str }}</p>
+                        <p><strong>Front Setback:</strong> {{ front_str }} ft</p>
+                        <p><strong>Living Room:</strong> {{ living_str }} sq.ft</p>
+                        <p><strong>Kitchen:</strong> {{ kitchen_str }} sq.ft</p>
+                    </div>
+                </div>
+            </div>
+        </div>
+
+        <div class="mt-4">
+            <a href="/" class="btn btn-secondary">← Back to Home</a>
+        </div>
+    </div>
+</body>
+</html>
+'''
+
+ERROR_TMPL = _HEAD.format(title='Test Error - Architectural Design System') + '''
+<body>
+    <div class="container mt-5">
+        <div class="alert alert-danger">
+            <h4>Test Failed</h4>
+            <p><strong>Error:</strong> {{ error }}</p>
+            <p>This indicates that some core dependencies are missing or there are import issues.</p>
+        </div>
+        <a href="/" class="btn btn-secondary">← Back to Home</a>
+    </div>
+</body>
+</html>
+'''
+
+DEMO_HTML = _HEAD.format(title='Demo Data - Architectural Design System') + '''
+<body>
+    <div class="container mt-5">
+        <h2>Sample Design Data</h2>
+
+        <div class="row mt-4">
+            <div class="col-md-4">
+                <div class="card">
+                    <div class="card-header">
+                        <h5>2BHK Design</h5>
+                    </div>
+                    <div class="card-body">
+                        <p><strong>Plot:</strong> 800 sq.ft</p>
+                        <p><strong>Built Area:</strong> 650 sq.ft</p>
+                        <p><strong>Efficiency:</strong> 81%</p>
+                        <p><strong>Rooms:</strong> Living, Kitchen, 2 Bedrooms, 1 Bath</p>
+                    </div>
+                </div>
+            </div>
+
+            <div class="col-md-4">
+                <div class="card">
+                    <div class="card-header">
+                        <h5>3BHK Design</h5>
+                    </div>
+                    <div class="card-body">
+                        <p><strong>Plot:</strong> 1200 sq.ft</p>
+                        <p><strong>Built Area:</strong> 980 sq.ft</p>
+                        <p><strong>Efficiency:</strong> 78%</p>
+                        <p><strong>Rooms:</strong> Living, Kitchen, 3 Bedrooms, 2 Baths</p>
+                    </div>
+                </div>
+            </div>
+
+            <div class="col-md-4">
+                <div class="card">
+                    <div class="card-header">
+                        <h5>4BHK Villa</h5>
+                    </div>
+                    <div class="card-body">
+                        <p><strong>Plot:</strong> 2000 sq.ft</p>
+                        <p><strong>Built Area:</strong> 1600 sq.ft</p>
+                        <p><strong>Efficiency:</strong> 75%</p>
+                        <p><strong>Rooms:</strong> Living, Dining, Kitchen, 4 Bedrooms, 3 Baths</p>
+                    </div>
+                </div>
+            </div>
+        </div>
+
+        <div class="mt-4">
+            <a href="/" class="btn btn-secondary">← Back to Home</a>
+        </div>
+    </div>
+</body>
+</html>
+'''
+
+# home and demo have no template variables, so they are served as prebuilt bytes
+_HOME_BYTES = HOME_HTML.encode('utf-8')
+_DEMO_BYTES = DEMO_HTML.encode('utf-8')
+_HOME_ETAG = hashlib.blake2b(_HOME_BYTES, digest_size=16).hexdigest()
+
 def check_basic_imports():
     """Check if basic packages are available."""
+    if deps_verified('simple_start'):
+        print("+ Flask available")
+        return True
+    
+    # Reads Flask's installed dist-info without running any of its code
     try:
-        import flask
+        distribution('flask')
         print("+ Flask available")
+        mark_deps_verified('simple_start')
         return True
-    except ImportError:
+    except PackageNotFoundError:
         print("- Flask not available")
         return False
 
+@functools.lru_cache(maxsize=1)
+def _load_engine():
+    """Import the core engine once, on the first /test request."""
+    sys.path.insert(0, str(Path(__file__).parent))
+    from architectural_engine.schemas import DesignInput
+    from architectural_engine.calculator import ArchitecturalCalculator
+    return DesignInput, ArchitecturalCalculator
+
+def _warm_engine():
+    """Import the engine ahead of the first /test request."""
+    try:
+        _load_engine()
+    except Exception:
+        # /test reports the import error itself
+        pass
+
+@functools.lru_cache(maxsize=8)
+def _compute(land_size, facing, building_type, bedroom_config, staircase_type, floors):
+    """Run the core calculations for a test input; results are reused across requests."""
+    DesignInput, ArchitecturalCalculator = _load_engine()
+    design_input = DesignInput(land_size=land_size, facing=facing, building_type=building_type,
+                               bedroom_config=bedroom_config, staircase_type=staircase_type, floors=floors)
+    calculator = ArchitecturalCalculator()
+    far = calculator.calculate_far(design_input)
+    setbacks = calculator.calculate_setbacks(design_input)
+    room_allocation = calculator.calculate_room_allocation(design_input, far)
+    return far, setbacks, room_allocation
+
 def create_minimal_app():
     """Create a minimal Flask app if full app fails."""
-    from flask import Flask, render_template_string
+    from flask import Flask, Response, request, send_from_directory
     
     app = Flask(__name__)
+    # The templates are fixed strings, so compile them once here rather than per request
+    app.jinja_env.auto_reload = False
+    _test = app.jinja_env.from_string(TEST_TMPL)
+    _error = app.jinja_env.from_string(ERROR_TMPL)
+    
+    def static_page(body, etag):
+        # Repeat visitors revalidating with a matching ETag get an empty 304
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            response = Response(body, mimetype='text/html')
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'public, max-age=3600'
+        return response
+    
+    # The demo page is written out once and served as a file, which Werkzeug
+    # streams with the server's file wrapper (sendfile where available)
+    demo_file = Path(app.static_folder) / 'demo.html'
+    if not demo_file.exists() or demo_file.read_bytes() != _DEMO_BYTES:
+        demo_file.parent.mkdir(parents=True, exist_ok=True)
+        demo_file.write_bytes(_DEMO_BYTES)
     
     @app.route('/')
     def home():
-        return render_template_string('''
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>Architectural Design System</title>
-            <meta name="viewport" content="width=device-width, initial-scale=1">
-            <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css" rel="stylesheet">
-        </head>
-        <body>
-            <div class="container mt-5">
-                <div class="row justify-content-center">
-                    <div class="col-md-8 text-center">
-                        <h1 class="display-4 mb-4">Architectural Design System</h1>
-                        <p class="lead mb-4">AI-Powered Residential Design Generator</p>
-                        
-                        <div class="alert alert-info">
-                            <h5>System Status: Basic Mode</h5>
-                            <p>The system is running in basic mode. Some advanced features may be limited due to missing dependencies.</p>
-                        </div>
-                        
-                        <div class="row mt-5">
-                            <div class="col-md-4 mb-3">
-                                <div class="card h-100">
-                                    <div class="card-body">
-                                        <h5 class="card-title">Design Engine</h5>
-                                        <p class="card-text">Core architectural calculations and room allocation algorithms.</p>
-                                        <span class="badge bg-success">Available</span>
-                                    </div>
-                                </div>
-                            </div>
-                            
-                            <div class="col-md-4 mb-3">
-                                <div class="card h-100">
-                                    <div class="card-body">
-                                        <h5 class="card-title">Visualizations</h5>
-                                        <p class="card-text">2D floor plans and analytical charts.</p>
-                                        <span class="badge bg-warning">Limited</span>
-                                    </div>
-                                </div>
-                            </div>
-                            
-                            <div class="col-md-4 mb-3">
-                                <div class="card h-100">
-                                    <div class="card-body">
-                                        <h5 class="card-title">Analytics</h5>
-                                        <p class="card-text">Space efficiency and optimization reports.</p>
-                                        <span class="badge bg-success">Available</span>
-                                    </div>
-                                </div>
-                            </div>
-                        </div>
-                        
-                        <div class="mt-4">
-                            <a href="/test" class="btn btn-primary btn-lg me-3">Test Core System</a>
-                            <a href="/demo" class="btn btn-outline-secondary btn-lg">View Demo Data</a>
-                        </div>
-                        
-                        <div class="mt-5">
-                            <h5>To enable full functionality:</h5>
-                            <code>pip install matplotlib numpy pandas seaborn pydantic</code>
-                        </div>
-                    </div>
-                </div>
-            </div>
-        </body>
-        </html>
-        ''')
+        return static_page(_HOME_BYTES, _HOME_ETAG)
     
     @app.route('/test')
     def test():
         try:
-            # Test core functionality
-            sys.path.insert(0, str(Path(__file__).parent))
-            from architectural_engine.schemas import DesignInput
-            from architectural_engine.calculator import ArchitecturalCalculator
-            
             # Create test input
             test_data = {
                 'land_size': 1000.0,
@@ -111,148 +292,24 @@ def create_minimal_app():
                 'floors': 1
             }
             
-            design_input = DesignInput(**test_data)
-            calculator = ArchitecturalCalculator()
-            
-            # Test calculations
-            far = calculator.calculate_far(design_input)
-            setbacks = calculator.calculate_setbacks(design_input)
-            room_allocation = calculator.calculate_room_allocation(design_input, far)
+            # Test core functionality
+            far, setbacks, room_allocation = _compute(**test_data)
             
-            return render_template_string('''
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <title>System Test - Architectural Design System</title>
-                <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css" rel="stylesheet">
-            </head>
-            <body>
-                <div class="container mt-5">
-                    <h2>Core System Test Results</h2>
-                    
-                    <div class="row mt-4">
-                        <div class="col-md-6">
-                            <div class="card">
-                                <div class="card-header bg-success text-white">
-                                    <h5>Input Parameters</h5>
-                                </div>
-                                <div class="card-body">
-                                    <p><strong>Land Size:</strong> {{ test_data.land_size }} sq.ft</p>
-                                    <p><strong>Facing:</strong> {{ test_data.facing }}</p>
-                                    <p><strong>Type:</strong> {{ test_data.building_type }}</p>
-                                    <p><strong>Configuration:</strong> {{ test_data.bedroom_config }}</p>
-                                </div>
-                            </div>
-                        </div>
-                        
-                        <div class="col-md-6">
-                            <div class="card">
-                                <div class="card-header bg-primary text-white">
-                                    <h5>Calculated Results</h5>
-                                </div>
-                                <div class="card-body">
-                                    <p><strong>FAR:</strong> {{ "%.2f"|format(far) }}</p>
-                                    <p><strong>Front Setback:</strong> {{ setbacks.front }} ft</p>
-                                    <p><strong>Living Room:</strong> {{ "%.0f"|format(room_allocation.living_room) }} sq.ft</p>
-                                    <p><strong>Kitchen:</strong> {{ "%.0f"|format(room_allocation.kitchen) }} sq.ft</p>
-                                </div>
-                            </div>
-                        </div>
-                    </div>
-                    
-                    <div class="mt-4">
-                        <a href="/" class="btn btn-secondary">← Back to Home</a>
-                    </div>
-                </div>
-            </body>
-            </html>
-            ''', test_data=test_data, far=far, setbacks=setbacks, room_allocation=room_allocation)
+            # Numbers are formatted here so the template needs no filters
+            return _test.render(
+                test_data=test_data,
+                far_str=f'{far:.2f}',
+                front_str=str(setbacks.front),
+                living_str=f'{room_allocation.living_room:.0f}',
+                kitchen_str=f'{room_allocation.kitchen:.0f}',
+            )
             
         except Exception as e:
-            return render_template_string('''
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <title>Test Error - Architectural Design System</title>
-                <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css" rel="stylesheet">
-            </head>
-            <body>
-                <div class="container mt-5">
-                    <div class="alert alert-danger">
-                        <h4>Test Failed</h4>
-                        <p><strong>Error:</strong> {{ error }}</p>
-                        <p>This indicates that some core dependencies are missing or there are import issues.</p>
-                    </div>
-                    <a href="/" class="btn btn-secondary">← Back to Home</a>
-                </div>
-            </body>
-            </html>
-            ''', error=str(e))
+            return _error.render(error=str(e))
     
     @app.route('/demo')
     def demo():
-        return render_template_string('''
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>Demo Data - Architectural Design System</title>
-            <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css" rel="stylesheet">
-        </head>
-        <body>
-            <div class="container mt-5">
-                <h2>Sample Design Data</h2>
-                
-                <div class="row mt-4">
-                    <div class="col-md-4">
-                        <div class="card">
-                            <div class="card-header">
-                                <h5>2BHK Design</h5>
-                            </div>
-                            <div class="card-body">
-                                <p><strong>Plot:</strong> 800 sq.ft</p>
-                                <p><strong>Built Area:</strong> 650 sq.ft</p>
-                                <p><strong>Efficiency:</strong> 81%</p>
-                                <p><strong>Rooms:</strong> Living, Kitchen, 2 Bedrooms, 1 Bath</p>
-                            </div>
-                        </div>
-                    </div>
-                    
-                    <div class="col-md-4">
-                        <div class="card">
-                            <div class="card-header">
-                                <h5>3BHK Design</h5>
-                            </div>
-                            <div class="card-body">
-                                <p><strong>Plot:</strong> 1200 sq.ft</p>
-                                <p><strong>Built Area:</strong> 980 sq.ft</p>
-                                <p><strong>Efficiency:</strong> 78%</p>
-                                <p><strong>Rooms:</strong> Living, Kitchen, 3 Bedrooms, 2 Baths</p>
-                            </div>
-                        </div>
-                    </div>
-                    
-                    <div class="col-md-4">
-                        <div class="card">
-                            <div class="card-header">
-                                <h5>4BHK Villa</h5>
-                            </div>
-                            <div class="card-body">
-                                <p><strong>Plot:</strong> 2000 sq.ft</p>
-                                <p><strong>Built Area:</strong> 1600 sq.ft</p>
-                                <p><strong>Efficiency:</strong> 75%</p>
-                                <p><strong>Rooms:</strong> Living, Dining, Kitchen, 4 Bedrooms, 3 Baths</p>
-                            </div>
-                        </div>
-                    </div>
-                </div>
-                
-                <div class="mt-4">
-                    <a href="/" class="btn btn-secondary">← Back to Home</a>
-                </div>
-            </div>
-        </body>
-        </html>
-        ''')
+        return send_from_directory(app.static_folder, 'demo.html', max_age=3600)
     
     return app
 
@@ -267,9 +324,10 @@ def main():
         print("Please install Flask: pip install flask")
         sys.exit(1)
     
-    # Create output directories
-    Path("output").mkdir(exist_ok=True)
-    Path("static").mkdir(exist_ok=True)
+    # Create output directories; a stat suffices once they exist
+    for directory in ("output", "static"):
+        if not os.path.isdir(directory):
+            os.makedirs(directory, exist_ok=True)
     
     try:
         print("\nTrying to start full application...")
@@ -281,13 +339,22 @@ def main():
         print(f"- Full application failed to load: {e}")
         print("+ Starting in basic mode...")
         app = create_minimal_app()
+        # Overlap the engine import with server startup
+        threading.Thread(target=_warm_engine, daemon=True).start()
     
     try:
         print("\nStarting Flask server...")
         print("Application available at: http://localhost:5000")
         print("Press Ctrl+C to stop\n")
         
-        app.run(debug=True, host='0.0.0.0', port=5000)
+        if os.environ.get('PROD') == '1':
+            # Multi-threaded server without the dev server's reloader and debugger
+            from waitress import serve
+            app.jinja_env.auto_reload = False
+            app.config['TEMPLATES_AUTO_RELOAD'] = False
+            serve(app, host='0.0.0.0', port=5000, threads=8)
+        else:
+            app.run(debug=True, host='0.0.0.0', port=5000)
         
     except Exception as e:
         print(f"Failed to start server: {e}")
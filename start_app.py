@@ -4,12 +4,18 @@ Simple startup script for the Architectural Design System.
 """
 
 import sys
+import os
 import subprocess
-import importlib
+import importlib.util
 from pathlib import Path
 
+from deps_cache import deps_verified, mark_deps_verified
+
 def install_missing_packages():
     """Install missing packages."""
+    if deps_verified('start_app'):
+        return True
+    
     required_packages = [
         'flask',
         'numpy', 
@@ -20,22 +26,31 @@ def install_missing_packages():
         'pillow'
     ]
     
-    missing = []
-    for package in required_packages:
-        try:
-            importlib.import_module(package)
-        except ImportError:
-            missing.append(package)
+    # Distribution names whose import name differs
+    module_names = {'pillow': 'PIL'}
+    
+    # find_spec only locates each module; importing it would run its top-level code
+    missing = [p for p in required_packages if importlib.util.find_spec(module_names.get(p, p)) is None]
     
     if missing:
         print(f"Installing missing packages: {', '.join(missing)}")
-        try:
-            subprocess.check_call([sys.executable, "-m", "pip", "install"] + missing)
+        # A project-local pip cache turns reinstalls into a local unpack
+        env = {**os.environ, 'PIP_CACHE_DIR': str(Path(__file__).parent / '.pipcache')}
+        process = subprocess.Popen([
+            sys.executable, "-m", "pip", "install",
+            "--no-input", "--disable-pip-version-check", "--prefer-binary",
+        ] + missing, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+        # Stream pip's progress so a stalled download is visible
+        for line in process.stdout:
+            print(line, end='')
+        if process.wait() == 0:
             print("Packages installed successfully!")
-        except subprocess.CalledProcessError:
+        else:
             print(f"Failed to install packages. Please run manually:")
             print(f"pip install {' '.join(missing)}")
             return False
+    
+    mark_deps_verified('start_app')
     return True
 
 def main():
@@ -47,9 +62,10 @@ def main():
     if not install_missing_packages():
         sys.exit(1)
     
-    # Create output directory
-    Path("output").mkdir(exist_ok=True)
-    Path("static/output").mkdir(parents=True, exist_ok=True)
+    # Create output directories; a stat suffices once they exist
+    for directory in ("output", "static/output"):
+        if not os.path.isdir(directory):
+            os.makedirs(directory, exist_ok=True)
     
     try:
         print("\nStarting Flask application...")
@@ -58,7 +74,14 @@ def main():
         
         # Import and run the app
         from app import app
-        app.run(debug=True, host='0.0.0.0', port=5000)
+        if os.environ.get('PROD') == '1':
+            # Multi-threaded server without the dev server's reloader and debugger
+            from waitress import serve
+            app.jinja_env.auto_reload = False
+            app.config['TEMPLATES_AUTO_RELOAD'] = False
+            serve(app, host='0.0.0.0', port=5000, threads=8)
+        else:
+            app.run(debug=True, host='0.0.0.0', port=5000)
         
     except ImportError as e:
         print(f"Failed to import app: {e}")
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Shared checker for the verification scripts.
+"""
+
+import mmap
+import re
+from pathlib import Path
+
+current_dir = Path(__file__).parent
+
+def find_needles(path, needles):
+    """Map each byte-string needle to whether it occurs in the file at path."""
+    # One pass for all needles. The lookahead lets matches overlap, and with
+    # longer needles tried first, any needle not reported at a position is a
+    # substring of the one that was.
+    alternatives = b'|'.join(re.escape(n) for n in sorted(needles, key=len, reverse=True))
+    pattern = re.compile(b'(?=(' + alternatives + b'))')
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        matched = {m.group(1) for m in pattern.finditer(mm)}
+    return {needle: any(needle in m for m in matched) for needle in needles}
+
+def verify(sections):
+    """
+    Run a table of checks, stopping at the first failure.
+
+    Each section is (heading, relative_path, checks); each check is
+    (needles, ok_msg, fail_msg[, present]) and passes when every needle is
+    present, or when every needle is absent if present is False.
+    """
+    for heading, relative_path, checks in sections:
+        print(f"\n{heading}")
+
+        path = current_dir / relative_path
+        if not path.exists():
+            print(f"   ✗ {relative_path} missing")
+            return False
+
+        # Each file is read once for all of its section's needles
+        found = find_needles(path, {n for check in checks for n in check[0]})
+
+        for needles, ok_msg, fail_msg, *rest in checks:
+            present = rest[0] if rest else True
+            if all(found[n] == present for n in needles):
+                print(f"   ✓ {ok_msg}")
+            else:
+                print(f"   ✗ {fail_msg}")
+                return False
+
+    return True
@@ -11,48 +11,31 @@ from pathlib import Path
 current_dir = Path(__file__).parent
 sys.path.insert(0, str(current_dir))
 
+from verify import verify
+
+CHECKS_NEW_TAB = [
+    ("1. Checking 3D tab implementation:", 'templates/results.html', [
+        ((b'target="_blank"', b'3D View'),
+         "3D tab opens in new tab (target='_blank')", "3D tab not configured for new tab"),
+        ((b'New Tab', b'fa-external-link-alt'),
+         "3D tab has 'New Tab' badge and external link icon", "Missing visual indicators for new tab"),
+        ((b'nav-link[target="_blank"]',),
+         "Special CSS styling for 3D tab", "Missing CSS styling for 3D tab"),
+        ((b'linear-gradient',),
+         "Professional gradient styling applied", "Missing gradient styling"),
+        # Embedded 3D content must be gone
+        ((b'iframe src="{{ visualizations[\'3d_visualization\'] }}"',),
+         "Embedded 3D iframe removed (no longer inline)", "Embedded 3D iframe still present", False),
+    ]),
+]
+
 def verify_3d_new_tab():
     """Verify that 3D view opens in new tab."""
     
     print("3D New Tab Implementation Verification")
     print("=" * 45)
     
-    # Check results.html template
-    template_file = current_dir / 'templates' / 'results.html'
-    with open(template_file, 'r') as f:
-        template_content = f.read()
-    
-    print("\n1. Checking 3D tab implementation:")
-    
-    if 'target="_blank"' in template_content and '3D View' in template_content:
-        print("   ✓ 3D tab opens in new tab (target='_blank')")
-    else:
-        print("   ✗ 3D tab not configured for new tab")
-        return False
-    
-    if 'New Tab' in template_content and 'fa-external-link-alt' in template_content:
-        print("   ✓ 3D tab has 'New Tab' badge and external link icon")
-    else:
-        print("   ✗ Missing visual indicators for new tab")
-        return False
-    
-    if 'nav-link[target="_blank"]' in template_content:
-        print("   ✓ Special CSS styling for 3D tab")
-    else:
-        print("   ✗ Missing CSS styling for 3D tab")
-        return False
-    
-    if 'linear-gradient' in template_content:
-        print("   ✓ Professional gradient styling applied")
-    else:
-        print("   ✗ Missing gradient styling")
-        return False
-    
-    # Check that embedded 3D content is removed
-    if 'iframe src="{{ visualizations[\'3d_visualization\'] }}"' not in template_content:
-        print("   ✓ Embedded 3D iframe removed (no longer inline)")
-    else:
-        print("   ✗ Embedded 3D iframe still present")
+    if not verify(CHECKS_NEW_TAB):
         return False
     
     print("\n2. Implementation Summary:")
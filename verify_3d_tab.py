@@ -11,92 +11,44 @@ from pathlib import Path
 current_dir = Path(__file__).parent
 sys.path.insert(0, str(current_dir))
 
+from verify import verify
+
+CHECKS_TAB = [
+    ("1. Checking app.py implementation:", 'app.py', [
+        ((b"'3d_visualization': f'/static/output/{project_id}/3d_visualization.html'",),
+         "3D visualization path is included in view_results", "3D visualization path missing in view_results"),
+        ((b"render_3d_html = renderer_3d.render_3d_building",),
+         "3D rendering is implemented in design generation", "3D rendering missing in design generation"),
+        ((b"basic_3d_html",),
+         "Fallback 3D placeholder is implemented", "Fallback 3D placeholder missing"),
+    ]),
+    ("2. Checking results.html template:", 'templates/results.html', [
+        ((b"3D View", b"fas fa-cube"),
+         "3D tab is defined in template", "3D tab missing in template"),
+        ((b"3d-view-tab", b"3d-view"),
+         "3D tab navigation is properly configured", "3D tab navigation missing"),
+        ((b"Interactive 3D Visualization",),
+         "3D tab content is implemented", "3D tab content missing"),
+        # Check for conditional logic
+        ((b"<!-- 3D Renderer Tab - Always show -->",),
+         "3D tab is set to always show", "3D tab may be conditionally hidden"),
+    ]),
+    ("3. Checking 3D renderer implementation:", 'visualization/renderer_3d.py', [
+        ((), "3D renderer file exists", "3D renderer file missing"),
+        ((b"create_simple_3d_placeholder",),
+         "3D placeholder method is implemented", "3D placeholder method missing"),
+        ((b"render_3d_building",),
+         "Full 3D building rendering is implemented", "Full 3D building rendering missing"),
+    ]),
+]
+
 def verify_3d_tab_implementation():
     """Verify that 3D tab will appear in the UI."""
     
     print("3D Tab Implementation Verification")
     print("=" * 40)
     
-    # Check app.py implementation
-    print("\n1. Checking app.py implementation:")
-    
-    app_file = current_dir / 'app.py'
-    with open(app_file, 'r') as f:
-        app_content = f.read()
-    
-    if "'3d_visualization': f'/static/output/{project_id}/3d_visualization.html'" in app_content:
-        print("   ✓ 3D visualization path is included in view_results")
-    else:
-        print("   ✗ 3D visualization path missing in view_results")
-        return False
-    
-    if "render_3d_html = renderer_3d.render_3d_building" in app_content:
-        print("   ✓ 3D rendering is implemented in design generation")
-    else:
-        print("   ✗ 3D rendering missing in design generation")
-        return False
-    
-    if "basic_3d_html" in app_content:
-        print("   ✓ Fallback 3D placeholder is implemented")
-    else:
-        print("   ✗ Fallback 3D placeholder missing")
-        return False
-    
-    # Check results.html template
-    print("\n2. Checking results.html template:")
-    
-    template_file = current_dir / 'templates' / 'results.html'
-    with open(template_file, 'r') as f:
-        template_content = f.read()
-    
-    if "3D View" in template_content and "fas fa-cube" in template_content:
-        print("   ✓ 3D tab is defined in template")
-    else:
-        print("   ✗ 3D tab missing in template")
-        return False
-    
-    if "3d-view-tab" in template_content and "3d-view" in template_content:
-        print("   ✓ 3D tab navigation is properly configured")
-    else:
-        print("   ✗ 3D tab navigation missing")
-        return False
-    
-    if "Interactive 3D Visualization" in template_content:
-        print("   ✓ 3D tab content is implemented")
-    else:
-        print("   ✗ 3D tab content missing")
-        return False
-    
-    # Check for conditional logic
-    if "<!-- 3D Renderer Tab - Always show -->" in template_content:
-        print("   ✓ 3D tab is set to always show")
-    else:
-        print("   ✗ 3D tab may be conditionally hidden")
-        return False
-    
-    # Check 3D renderer
-    print("\n3. Checking 3D renderer implementation:")
-    
-    renderer_file = current_dir / 'visualization' / 'renderer_3d.py'
-    if renderer_file.exists():
-        print("   ✓ 3D renderer file exists")
-        
-        with open(renderer_file, 'r') as f:
-            renderer_content = f.read()
-        
-        if "create_simple_3d_placeholder" in renderer_content:
-            print("   ✓ 3D placeholder method is implemented")
-        else:
-            print("   ✗ 3D placeholder method missing")
-            return False
-        
-        if "render_3d_building" in renderer_content:
-            print("   ✓ Full 3D building rendering is implemented")
-        else:
-            print("   ✗ Full 3D building rendering missing")
-            return False
-    else:
-        print("   ✗ 3D renderer file missing")
+    if not verify(CHECKS_TAB):
         return False
     
     print("\n4. Summary of 3D Tab Implementation:")
@@ -0,0 +1,295 @@
+"""
+Shared base for the 2D blueprint renderers in cad_renderer and
+cad_renderer_professional: common colors, grid, room labels, styling,
+north arrow and PNG encoding.
+"""
+
+# Figures are drawn on an Agg canvas directly, without pyplot or a global backend
+import matplotlib
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.patches import BoxStyle, Circle
+from matplotlib.collections import LineCollection, PathCollection
+from matplotlib.font_manager import FontProperties
+from matplotlib.textpath import TextPath, text_to_path
+from matplotlib.transforms import Affine2D
+import numpy as np
+from typing import Optional, Tuple
+from pathlib import Path
+from functools import lru_cache
+from collections import OrderedDict
+import hashlib
+import io
+import base64
+import math
+import threading
+
+# Numba is optional; without it the segment builders run as plain Python
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+# Let Agg rasterize long paths (grids, collections) in chunks, and drop
+# path vertices that deviate from a straight run by less than a pixel
+matplotlib.rcParams['agg.path.chunksize'] = 10000
+matplotlib.rcParams['path.simplify'] = True
+matplotlib.rcParams['path.simplify_threshold'] = 1.0
+
+@njit(cache=True)
+def _grid_segments(extent, step, vertical):
+    """
+    Segments for grid lines at 0, step, 2*step, ... up to extent + step (exclusive),
+    matching np.arange. Each line runs 0 to 1 in axes coordinates across the grid.
+    """
+    n = max(int(math.ceil((extent + step) / step)), 0)
+    out = np.empty((n, 2, 2), np.float64)
+    for i in range(n):
+        pos = i * step
+        if vertical:
+            out[i, 0, 0] = pos
+            out[i, 0, 1] = 0.0
+            out[i, 1, 0] = pos
+            out[i, 1, 1] = 1.0
+        else:
+            out[i, 0, 0] = 0.0
+            out[i, 0, 1] = pos
+            out[i, 1, 0] = 1.0
+            out[i, 1, 1] = pos
+    return out
+
+@lru_cache(maxsize=4096)
+def _label_glyphs(text: str, fontsize: float, weight: str = 'normal', style: str = 'normal'):
+    """
+    Glyph outlines of a one-line label in points, placed like ha='center',
+    va='center' text around the origin, with the label's layout width and height.
+    
+    Measuring and outlining a string is the costly part of drawing text, so
+    each (string, font) pair is done once and reused across renders.
+    """
+    prop = FontProperties(size=fontsize, weight=weight, style=style)
+    width, height, descent = text_to_path.get_text_width_height_descent(text, prop, ismath=False)
+    # Like Text, every line is at least as tall and deep as "lp"
+    _, lp_height, lp_descent = text_to_path.get_text_width_height_descent('lp', prop, ismath=False)
+    height, descent = max(height, lp_height), max(descent, lp_descent)
+    return TextPath((-width / 2, descent - height / 2), text, prop=prop), width, height
+
+@lru_cache(maxsize=4096)
+def _label_box(text: str, fontsize: float, pad: float):
+    """Rounded box outline in points around a centred label, like Text's bbox with boxstyle 'round'."""
+    _, width, height = _label_glyphs(text, fontsize)
+    return BoxStyle('round', pad=pad)(-width / 2, -height / 2, width, height, fontsize)
+
+class _CADRendererBase:
+    """Drawing and encoding steps shared by both CADRenderer classes."""
+    
+    # Resolution of the saved PNG
+    output_dpi = 300
+    
+    # Grid lines closer together than this many output pixels are skipped
+    min_grid_spacing_px = 4
+    
+    # Figures kept for reuse by each rendering thread
+    max_cached_figures = 4
+    
+    def __init__(self):
+        # Blueprint colors common to both renderers
+        self.wall_color = '#000000'  # Black walls for professional look
+        self.room_fill_color = '#FFFFFF'  # White interior
+        self.room_edge_color = '#000000'
+        self.dimension_color = '#FF0000'  # Red dimensions (standard)
+        self.dimension_line_color = '#000000'
+        self.text_color = '#000000'
+        self.door_color = '#8B4513'  # Brown doors
+        self.window_color = '#4169E1'  # Blue windows
+        self.title_box_color = '#F0F8FF'
+        
+        # Compile the grid segment builder now rather than on the first render
+        if NUMBA_AVAILABLE:
+            _grid_segments(1.0, 1.0, True)
+        
+        # Figures reused across renders, keyed on rounded (width, height) in
+        # inches. Each thread keeps its own, since a render draws into the
+        # figure's single Agg buffer and renders can run concurrently.
+        self._fig_local = threading.local()
+        
+        # Tight crop boxes for saving, keyed on the layout that determines them
+        self._bbox_cache = {}
+    
+    def _prepare_canvas(self, fig_width: float, fig_height: float):
+        """Return a blank (fig, ax) pair, reusing this thread's cached figure of similar size."""
+        fig_cache = getattr(self._fig_local, 'figures', None)
+        if fig_cache is None:
+            fig_cache = self._fig_local.figures = OrderedDict()
+        key = (round(fig_width), round(fig_height))
+        if key in fig_cache:
+            fig, ax = fig_cache[key]
+            fig_cache.move_to_end(key)
+            ax.clear()
+            fig.set_size_inches(fig_width, fig_height)
+            fig.patch.set_facecolor('white')
+        else:
+            # Built without pyplot, whose global figure registry is not thread-safe
+            fig = Figure(figsize=(fig_width, fig_height), facecolor='white')
+            FigureCanvasAgg(fig)
+            ax = fig.subplots()
+            fig_cache[key] = (fig, ax)
+            if len(fig_cache) > self.max_cached_figures:
+                fig_cache.popitem(last=False)
+        return fig, ax
+    
+    @staticmethod
+    @lru_cache(maxsize=8192)
+    def _room_labels(room_name: str, length: float, width: float) -> Tuple[str, str, str]:
+        """Display name, dimensions and area lines for a room label."""
+        return (room_name.replace('_', ' ').title(),
+                f"{length:.1f}' × {width:.1f}'",
+                f"{length * width:.0f} sq.ft")
+    
+    def _draw_room_labels(self, ax, centers_x, centers_y, labels, line_offset: float,
+                          box_pad: float, box_alpha: float):
+        """
+        Draw every room's label: the name in bold above the centre, the
+        dimensions in italic on it and the area in a rounded box below.
+        
+        labels holds one (name, dimensions, area) tuple per room, and
+        line_offset is the distance in feet from the centre to the name and
+        area lines. All glyphs go into one collection and all boxes into
+        another, rather than three Text artists per room.
+        """
+        glyphs, glyph_offsets, boxes, box_offsets = [], [], [], []
+        for x, y, (name, dims, area) in zip(centers_x, centers_y, labels):
+            glyphs += [_label_glyphs(name, self.room_label_fontsize, weight='bold')[0],
+                       _label_glyphs(dims, self.area_fontsize, style='italic')[0],
+                       _label_glyphs(area, self.area_fontsize)[0]]
+            glyph_offsets += [(x, y + line_offset), (x, y), (x, y - line_offset)]
+            boxes.append(_label_box(area, self.area_fontsize, box_pad))
+            box_offsets.append((x, y - line_offset))
+        if not glyphs:
+            return
+        
+        # Outlines are in points around each label's anchor, which sits in data coordinates
+        points = Affine2D().scale(1 / 72) + ax.figure.dpi_scale_trans
+        common = dict(offset_transform=ax.transData, transform=points, zorder=3, clip_on=False)
+        ax.add_collection(PathCollection(boxes, offsets=box_offsets, facecolors='white',
+                                         edgecolors='gray', alpha=box_alpha, **common), autolim=False)
+        ax.add_collection(PathCollection(glyphs, offsets=glyph_offsets, facecolors=self.text_color,
+                                         edgecolors='none', linewidths=0, **common), autolim=False)
+    
+    def _points_per_foot(self, fig, building_length: float, building_width: float) -> float:
+        """Scale of the plan in points per foot, from the figure size and the axes limits."""
+        # Matches the limits set in _apply_professional_styling; with equal
+        # aspect the tighter of the two directions sets the scale
+        margin = 5
+        params = fig.subplotpars
+        fig_width, fig_height = fig.get_size_inches()
+        axes_width = fig_width * (params.right - params.left) * 72
+        axes_height = fig_height * (params.top - params.bottom) * 72
+        return min(axes_width / (building_length + 2 * margin),
+                   axes_height / (building_width + 2 * margin + 10))
+    
+    def _add_professional_grid(self, ax, building_length: float, building_width: float):
+        """Add professional architectural grid."""
+        # Grid spacing in output pixels: lines packed tighter than
+        # min_grid_spacing_px only blur into a grey wash, so thin them out
+        px_per_foot = self._points_per_foot(ax.figure, building_length, building_width) * self.output_dpi / 72
+        
+        # Major grid lines every 5 feet (thick), or every 10 when even that is too dense
+        major_step = 5 if px_per_foot * 5 >= self.min_grid_spacing_px else 10
+        self._add_grid_lines(ax, building_length, building_width, major_step, linewidth=0.8, alpha=0.7)
+        
+        # Minor grid lines every 1 foot (thin)
+        if px_per_foot >= self.min_grid_spacing_px:
+            self._add_grid_lines(ax, building_length, building_width, 1, linewidth=0.3, alpha=0.5)
+    
+    def _add_grid_lines(self, ax, building_length: float, building_width: float, step: float,
+                        linewidth: float, alpha: float):
+        """
+        Add one set of full-height/full-width grid lines as two LineCollections.
+        
+        The collections are rasterized: in vector output (PDF/SVG) the dense
+        grid becomes one bitmap layer instead of hundreds of stroked paths.
+        """
+        # Like axvline/axhline, lines span the whole axes: x (or y) is in data
+        # coordinates and the other end runs from 0 to 1 in axes coordinates
+        vertical = _grid_segments(float(building_length), float(step), True)
+        horizontal = _grid_segments(float(building_width), float(step), False)
+        
+        for segments, transform in ((vertical, ax.get_xaxis_transform()),
+                                    (horizontal, ax.get_yaxis_transform())):
+            ax.add_collection(LineCollection(segments, colors=self.grid_color, linewidths=linewidth,
+                                             alpha=alpha, transform=transform, rasterized=True),
+                              autolim=False)
+    
+    def _draw_north_arrow(self, ax, x: float, y: float):
+        """Draw simple north arrow."""
+        # Arrow shaft
+        ax.arrow(x, y, 0, 2, head_width=0.3, head_length=0.3,
+                fc='black', ec='black', linewidth=2)
+        
+        # "N" label
+        ax.text(x, y + 2.8, 'N', ha='center', va='center',
+               fontsize=self.label_fontsize, fontweight='bold')
+        
+        # Circle
+        circle = Circle((x, y + 1), 0.8, fill=False, edgecolor='black', linewidth=1.5)
+        ax.add_patch(circle)
+    
+    def _apply_professional_styling(self, ax, building_length: float, building_width: float):
+        """Apply professional architectural drawing styling."""
+        # Set limits with margins for dimensions
+        margin = 5
+        ax.set_xlim(-margin, building_length + margin)
+        ax.set_ylim(-margin, building_width + margin + 10)  # Extra space for title block
+        
+        # Equal aspect ratio
+        ax.set_aspect('equal')
+        
+        # Remove ticks and spines for clean look; the white figure background
+        # shows through where the axes patch is no longer drawn
+        ax.set_axis_off()
+    
+    @staticmethod
+    def _layout_key(floor_plan, *options) -> tuple:
+        """
+        Crop box cache key for a render: a digest of the whole floor plan
+        (rooms, openings, dimensions, floor number) plus the render options.
+        """
+        digest = hashlib.blake2b(floor_plan.model_dump_json().encode(), digest_size=16).digest()
+        return (digest,) + options
+    
+    def _save_and_encode(self, fig, output_path: Optional[str], layout_key: Optional[tuple] = None) -> str:
+        """
+        Save figure and return base64 encoded string.
+        
+        layout_key identifies everything that decides the drawing's extent; a
+        repeat render with the same key reuses the crop box measured last time.
+        """
+        # Work out the tight crop box ourselves so saving doesn't repeat the
+        # layout pass that bbox_inches='tight' performs
+        bbox = self._bbox_cache.get(layout_key) if layout_key is not None else None
+        if bbox is None:
+            bbox = fig.get_tightbbox(fig.canvas.get_renderer()).padded(matplotlib.rcParams['savefig.pad_inches'])
+            if layout_key is not None:
+                if len(self._bbox_cache) >= 256:
+                    self._bbox_cache.clear()
+                self._bbox_cache[layout_key] = bbox
+        
+        # Render the PNG once, in memory; fast zlib level suits flat line art
+        buffer = io.BytesIO()
+        fig.canvas.print_figure(buffer, format='png', dpi=self.output_dpi, bbox_inches=bbox,
+                                facecolor='white', edgecolor='none',
+                                pil_kwargs={'compress_level': 1})
+        png_data = buffer.getbuffer()  # a view, not a copy of the PNG bytes
+        
+        # Save to file if path provided, reusing the encoded bytes
+        if output_path:
+            Path(output_path).write_bytes(png_data)
+        
+        # Convert to base64 for web display
+        return base64.b64encode(png_data).decode('ascii')
@@ -12,18 +12,20 @@ Features:
 - Balcony and utility room representations
 """
 
-# Set matplotlib backend before importing pyplot
-import matplotlib
-matplotlib.use('Agg')  # Use non-interactive backend
-
-import matplotlib.pyplot as plt
 import matplotlib.patches as patches
+from matplotlib.colors import to_rgba
+from matplotlib.path import Path as MplPath
+from matplotlib.transforms import Affine2D
 from matplotlib.patches import Rectangle, FancyBboxPatch, Circle, Arrow, FancyArrowPatch
+from matplotlib.collections import EllipseCollection, LineCollection, PatchCollection, PathCollection, PolyCollection
 import numpy as np
 from typing import Dict, List, Tuple, Optional
-import io
-import base64
 import math
+import copy
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import lru_cache
 
 import sys
 from pathlib import Path
@@ -33,24 +35,73 @@ current_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(current_dir))
 
 from architectural_engine.schemas import FloorPlan, RoomDimensions, DoorWindow
+from ._cad_base import _CADRendererBase
+
+# (keywords, room type) in priority order; the first keyword found in a room name wins
+_ROOM_TYPE_KEYWORDS = (
+    (('stair',), 'staircase'),
+    (('balcony',), 'balcony'),
+    (('utility', 'store'), 'utility'),
+    (('bathroom', 'toilet'), 'bathroom'),
+    (('kitchen',), 'kitchen'),
+    (('living',), 'living_room'),
+    (('bedroom', 'master'), 'bedroom'),
+    (('dining',), 'dining'),
+    (('pooja',), 'pooja_room'),
+)
+
+# Room types indexed by the small integer codes stored in room arrays
+_ROOM_TYPES = tuple(room_type for _, room_type in _ROOM_TYPE_KEYWORDS) + ('general',)
+_ROOM_TYPE_CODES = {room_type: code for code, room_type in enumerate(_ROOM_TYPES)}
+
+class _RoomLayers:
+    """Room patches and collections buffered during one render, added a layer at a time."""
+    
+    def __init__(self, wall_stroke: float):
+        # Line width in points for room walls (half the wall thickness)
+        self.wall_stroke = wall_stroke
+        self.wall_patches = []
+        self.fixture_patches = []
+        # Prebuilt collections drawn over the fixture patches
+        self.fixture_collections = []
 
-class CADRenderer:
+# Room types that get their own length and width dimension lines
+_DIMENSIONED_TYPES = np.array([_ROOM_TYPE_CODES[t] for t in ('living_room', 'bedroom', 'kitchen')], dtype='u1')
+
+# Column layout of the per-render room array built by CADRenderer._room_array
+_ROOM_DTYPE = np.dtype([('x', 'f8'), ('y', 'f8'), ('l', 'f8'), ('w', 'f8'), ('type', 'u1')])
+
+class CADRenderer(_CADRendererBase):
     """Renders professional architect-quality 2D floor plans with proper dimensions and labels."""
     
+    # Shared by all renderers; Agg releases the GIL while rasterizing, so
+    # batch renders overlap on multiple cores
+    _render_pool = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix='cad-render')
+    
+    # Fixed tints by room type; staircase, balcony and utility rooms use the
+    # instance colors, and anything else falls back to room_fill_color
+    _FILL_COLORS = {
+        'bathroom': '#E0F6FF',  # Light blue
+        'kitchen': '#FFF8DC',   # Cornsilk
+        'bedroom': '#F0F8FF',   # Alice blue
+        'dining': '#FDF5E6',    # Old lace
+        'pooja_room': '#FFE4E1', # Misty rose
+    }
+    
+    # Title block floor names, by floor number
+    _FLOOR_NAMES = {
+        0: "Ground Floor",
+        1: "First Floor", 
+        2: "Second Floor",
+        3: "Third Floor"
+    }
+    
     def __init__(self):
+        super().__init__()
+        
         # Professional Blueprint styling parameters
-        self.wall_color = '#000000'  # Black walls for professional look
         self.wall_linewidth = 3.0  # Thicker walls for better visibility
-        self.interior_wall_linewidth = 2.0  # Interior walls slightly thinner
-        self.room_fill_color = '#FFFFFF'  # White interior
-        self.room_edge_color = '#000000'
-        self.dimension_color = '#FF0000'  # Red dimensions (standard)
-        self.dimension_line_color = '#000000'
-        self.text_color = '#000000'
         self.grid_color = '#E8E8E8'  # Professional grid color
-        self.door_color = '#8B4513'  # Brown doors
-        self.window_color = '#4169E1'  # Blue windows
-        self.title_box_color = '#F0F8FF'
         self.stair_color = '#696969'  # Gray for stairs
         self.balcony_color = '#F5F5DC'  # Beige for balconies
         self.utility_color = '#E6E6FA'  # Lavender for utility areas
@@ -69,6 +120,24 @@ class CADRenderer:
         self.arrow_size = 0.5
         self.wall_thickness = 0.75  # Standard 9-inch wall thickness
         
+        # Title block border styles, shared by every render
+        self._title_rect_style = dict(linewidth=2.5, edgecolor=self.text_color,
+                                      facecolor=self.title_box_color, alpha=0.95)
+        self._title_inner_rect_style = dict(linewidth=1, edgecolor=self.text_color,
+                                            facecolor='none')
+        
+        # Title block text styles
+        self._title_kwargs = dict(ha='center', va='center', fontsize=self.title_fontsize,
+                                  fontweight='bold', color=self.text_color)
+        self._floor_kwargs = dict(ha='center', va='center', fontsize=self.subtitle_fontsize,
+                                  fontweight='bold', color=self.text_color,
+                                  bbox=dict(boxstyle="round,pad=0.3", facecolor='yellow', alpha=0.4))
+        self._spec_kwargs = dict(ha='left', va='center', fontsize=self.label_fontsize, color=self.text_color)
+        self._date_kwargs = dict(ha='left', va='center', fontsize=self.area_fontsize, color=self.text_color)
+        
+        # Door swing arcs by (rounded width, wall direction); copies are re-centred per door
+        self._arc_cache: Dict[Tuple[float, str], patches.Arc] = {}
+        
         # Professional architectural standards
         self.door_swing_radius = 3.0  # Standard door swing
         self.window_sill_height = 3.0  # Standard window sill
@@ -100,23 +169,30 @@ class CADRenderer:
         fig_width = max(16, building_length * 0.25)
         fig_height = max(12, building_width * 0.25)
         
-        fig, ax = plt.subplots(1, 1, figsize=(fig_width, fig_height))
-        fig.patch.set_facecolor('white')
+        fig, ax = self._prepare_canvas(fig_width, fig_height)
+        
+        # Room patches are buffered per render and added as one collection per
+        # layer. Each room draws half the wall thickness inside its own
+        # outline, so shared walls come out at full thickness.
+        layers = _RoomLayers(self._points_per_foot(fig, building_length, building_width)
+                             * self.wall_thickness / 2)
         
         # Add professional grid
         if show_grid:
             self._add_professional_grid(ax, building_length, building_width)
         
         # Draw rooms with professional styling
-        self._draw_rooms_professional(ax, floor_plan.rooms)
+        room_arr = self._room_array(floor_plan.rooms)
+        self._draw_rooms_professional(ax, floor_plan.rooms, room_arr, layers)
+        self._flush_room_patches(ax, layers)
         
         # Draw doors and windows
-        if hasattr(floor_plan, 'doors_windows') and floor_plan.doors_windows:
+        if floor_plan.doors_windows:
             self._draw_doors_windows_professional(ax, floor_plan.doors_windows)
         
         # Add professional dimensions
         if show_dimensions:
-            self._add_professional_dimensions(ax, floor_plan.rooms, building_length, building_width)
+            self._add_professional_dimensions(ax, room_arr, building_length, building_width)
         
         # Add professional title block and labels
         self._add_professional_title_block(ax, title, floor_plan, building_length, building_width, total_area)
@@ -124,136 +200,136 @@ class CADRenderer:
         # Set professional styling
         self._apply_professional_styling(ax, building_length, building_width)
         
-        # Save and return
-        return self._save_and_encode(fig, output_path)
+        # Save and return; only identical plans drawn with the same options share a crop box
+        layout_key = self._layout_key(floor_plan, title, show_dimensions, show_grid)
+        return self._save_and_encode(fig, output_path, layout_key)
     
-    def _add_professional_grid(self, ax, building_length: float, building_width: float):
-        """Add professional architectural grid."""
-        # Major grid lines every 5 feet (thick)
-        major_x = np.arange(0, building_length + 5, 5)
-        major_y = np.arange(0, building_width + 5, 5)
-        
-        for x in major_x:
-            ax.axvline(x, color=self.grid_color, linewidth=0.8, alpha=0.7)
-        for y in major_y:
-            ax.axhline(y, color=self.grid_color, linewidth=0.8, alpha=0.7)
-        
-        # Minor grid lines every 1 foot (thin)
-        minor_x = np.arange(0, building_length + 1, 1)
-        minor_y = np.arange(0, building_width + 1, 1)
-        
-        for x in minor_x:
-            ax.axvline(x, color=self.grid_color, linewidth=0.3, alpha=0.5)
-        for y in minor_y:
-            ax.axhline(y, color=self.grid_color, linewidth=0.3, alpha=0.5)
+    def render_floor_plans_batch(self, floor_plans: List[FloorPlan],
+                                 titles: Optional[List[str]] = None, **kwargs) -> List[str]:
+        """
+        Render several floor plans in parallel on the shared thread pool.
+        
+        Args:
+            floor_plans: FloorPlan objects to render
+            titles: Optional title per plan; defaults to render_floor_plan's title
+            **kwargs: Passed through to render_floor_plan
+            
+        Returns:
+            Base64 encoded image strings, in the same order as floor_plans
+        """
+        if titles is None:
+            titles = [None] * len(floor_plans)
+        
+        futures = [self._render_pool.submit(self._render_in_worker, floor_plan, title, kwargs)
+                   for floor_plan, title in zip(floor_plans, titles)]
+        return [future.result() for future in futures]
+    
+    def _render_in_worker(self, floor_plan: FloorPlan, title: Optional[str], kwargs: dict) -> str:
+        """Render one plan of a batch on a pool thread."""
+        # Renders keep their buffers per call and their figures per thread,
+        # so the pool threads can all share this renderer
+        if title is not None:
+            kwargs = dict(kwargs, title=title)
+        return self.render_floor_plan(floor_plan, **kwargs)
     
-    def _draw_rooms_professional(self, ax, rooms: Dict[str, RoomDimensions]):
+    def _room_array(self, rooms: Dict[str, RoomDimensions]) -> np.ndarray:
+        """Copy room geometry and type codes into one structured array, in dict order."""
+        room_arr = np.empty(len(rooms), dtype=_ROOM_DTYPE)
+        for i, (room_name, room) in enumerate(rooms.items()):
+            room_arr[i] = (room.x_position, room.y_position, room.length, room.width,
+                           _ROOM_TYPE_CODES[self._get_room_type(room_name)])
+        return room_arr
+    
+    def _draw_rooms_professional(self, ax, rooms: Dict[str, RoomDimensions], room_arr: np.ndarray,
+                                 layers: _RoomLayers):
         """Draw rooms with professional architectural styling and specialized elements."""
-        for room_name, room in rooms.items():
+        # Wall, label and area geometry for every room in a few vectorized passes.
+        # Wall strokes are centred a quarter wall thickness inside the room
+        # outline; balconies keep a plain outline on their edge.
+        inset = np.where(room_arr['type'] == _ROOM_TYPE_CODES['balcony'], 0.0, self.wall_thickness / 4)
+        wall_x = room_arr['x'] + inset
+        wall_y = room_arr['y'] + inset
+        wall_l = room_arr['l'] - 2 * inset
+        wall_w = room_arr['w'] - 2 * inset
+        centers_x = room_arr['x'] + room_arr['l'] / 2
+        centers_y = room_arr['y'] + room_arr['w'] / 2
+        
+        for i, (room_name, room) in enumerate(rooms.items()):
             # Determine room type for specialized rendering
-            room_type = self._get_room_type(room_name)
+            room_type = _ROOM_TYPES[room_arr['type'][i]]
             
             # Select appropriate fill color based on room type
             fill_color = self._get_room_fill_color(room_type)
             
-            # Draw room rectangle with proper wall thickness
-            self._draw_room_walls(ax, room, room_type)
-            
-            # Fill room interior
-            interior_rect = Rectangle(
-                (room.x_position + self.wall_thickness/2, room.y_position + self.wall_thickness/2),
-                room.length - self.wall_thickness, room.width - self.wall_thickness,
-                linewidth=0,
-                facecolor=fill_color,
-                alpha=0.3
-            )
-            ax.add_patch(interior_rect)
+            # Draw room walls and interior fill as one rectangle
+            self._draw_room_walls(ax, layers, room_type, fill_color,
+                                  wall_x[i], wall_y[i], wall_l[i], wall_w[i])
             
             # Add specialized room elements
-            self._add_room_specific_elements(ax, room, room_type)
-            
-            # Add professional room labels
-            self._add_professional_room_labels(ax, room, room_name)
+            self._add_room_specific_elements(ax, layers, room, room_type)
+        
+        # Add professional room labels, all rooms at once
+        labels = [self._room_labels(room_name, room.length, room.width) for room_name, room in rooms.items()]
+        self._draw_room_labels(ax, centers_x, centers_y, labels, line_offset=1.2, box_pad=0.3, box_alpha=0.9)
     
-    def _get_room_type(self, room_name: str) -> str:
+    def _flush_room_patches(self, ax, layers: _RoomLayers):
+        """Add the buffered room patches, walls under fixtures."""
+        # Limits are set explicitly in _apply_professional_styling, so skip autolim
+        for buffered in (layers.wall_patches, layers.fixture_patches):
+            if buffered:
+                ax.add_collection(PatchCollection(buffered, match_original=True), autolim=False)
+        for collection in layers.fixture_collections:
+            ax.add_collection(collection, autolim=False)
+    
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _get_room_type(room_name: str) -> str:
         """Determine room type from name."""
         name_lower = room_name.lower()
-        if 'stair' in name_lower:
-            return 'staircase'
-        elif 'balcony' in name_lower:
-            return 'balcony'
-        elif 'utility' in name_lower or 'store' in name_lower:
-            return 'utility'
-        elif 'bathroom' in name_lower or 'toilet' in name_lower:
-            return 'bathroom'
-        elif 'kitchen' in name_lower:
-            return 'kitchen'
-        elif 'living' in name_lower:
-            return 'living_room'
-        elif 'bedroom' in name_lower or 'master' in name_lower:
-            return 'bedroom'
-        elif 'dining' in name_lower:
-            return 'dining'
-        elif 'pooja' in name_lower:
-            return 'pooja_room'
-        else:
-            return 'general'
+        for keywords, room_type in _ROOM_TYPE_KEYWORDS:
+            if any(keyword in name_lower for keyword in keywords):
+                return room_type
+        return 'general'
     
     def _get_room_fill_color(self, room_type: str) -> str:
         """Get appropriate fill color for room type."""
-        color_map = {
-            'staircase': self.stair_color,
-            'balcony': self.balcony_color,
-            'utility': self.utility_color,
-            'bathroom': '#E0F6FF',  # Light blue
-            'kitchen': '#FFF8DC',   # Cornsilk
-            'living_room': self.room_fill_color,
-            'bedroom': '#F0F8FF',   # Alice blue
-            'dining': '#FDF5E6',    # Old lace
-            'pooja_room': '#FFE4E1', # Misty rose
-            'general': self.room_fill_color
-        }
-        return color_map.get(room_type, self.room_fill_color)
+        if room_type == 'staircase':
+            return self.stair_color
+        if room_type == 'balcony':
+            return self.balcony_color
+        if room_type == 'utility':
+            return self.utility_color
+        return self._FILL_COLORS.get(room_type, self.room_fill_color)
     
-    def _draw_room_walls(self, ax, room: RoomDimensions, room_type: str):
-        """Draw room walls with proper thickness."""
-        # Outer wall rectangle (thick black lines)
-        outer_rect = Rectangle(
-            (room.x_position, room.y_position),
-            room.length, room.width,
-            linewidth=self.wall_linewidth,
+    def _draw_room_walls(self, ax, layers: _RoomLayers, room_type: str, fill_color: str,
+                         x: float, y: float, length: float, width: float):
+        """Draw room walls with proper thickness, filled with the room's tint."""
+        # Balconies typically have different wall treatment: a plain outline
+        linewidth = self.wall_linewidth if room_type == 'balcony' else layers.wall_stroke
+        wall_rect = Rectangle(
+            (x, y), length, width,
+            linewidth=linewidth,
             edgecolor=self.wall_color,
-            facecolor='none'
+            facecolor=to_rgba(fill_color, 0.3),
+            joinstyle='miter'
         )
-        ax.add_patch(outer_rect)
-        
-        # Inner wall rectangle (for wall thickness visualization)
-        if room_type != 'balcony':  # Balconies typically have different wall treatment
-            inner_rect = Rectangle(
-                (room.x_position + self.wall_thickness/2, room.y_position + self.wall_thickness/2),
-                room.length - self.wall_thickness, room.width - self.wall_thickness,
-                linewidth=self.interior_wall_linewidth,
-                edgecolor=self.wall_color,
-                facecolor='none',
-                alpha=0.7
-            )
-            ax.add_patch(inner_rect)
+        layers.wall_patches.append(wall_rect)
     
-    def _add_room_specific_elements(self, ax, room: RoomDimensions, room_type: str):
+    def _add_room_specific_elements(self, ax, layers: _RoomLayers, room: RoomDimensions, room_type: str):
         """Add room-specific architectural elements."""
         center_x = room.x_position + room.length / 2
         center_y = room.y_position + room.width / 2
         
         if room_type == 'staircase':
-            self._draw_staircase_symbol(ax, room)
+            self._draw_staircase_symbol(ax, layers, room)
         elif room_type == 'bathroom':
-            self._draw_bathroom_fixtures(ax, room)
+            self._draw_bathroom_fixtures(ax, layers, room)
         elif room_type == 'kitchen':
-            self._draw_kitchen_elements(ax, room)
+            self._draw_kitchen_elements(ax, layers, room)
         elif room_type == 'balcony':
-            self._draw_balcony_elements(ax, room)
+            self._draw_balcony_elements(ax, layers, room)
     
-    def _draw_staircase_symbol(self, ax, room: RoomDimensions):
+    def _draw_staircase_symbol(self, ax, layers: _RoomLayers, room: RoomDimensions):
         """Draw professional staircase symbol."""
         # Calculate stair parameters
         stair_width = min(room.length, room.width) * 0.8
@@ -262,19 +338,22 @@ class CADRenderer:
         start_x = room.x_position + (room.length - stair_width) / 2
         start_y = room.y_position + room.width * 0.1
         
-        # Draw individual stair treads
-        for i in range(num_treads):
-            tread_y = start_y + i * self.stair_tread_depth
-            if tread_y + self.stair_tread_depth <= room.y_position + room.width * 0.9:
-                tread_rect = Rectangle(
-                    (start_x, tread_y),
-                    stair_width, self.stair_tread_depth * 0.8,
-                    linewidth=1,
-                    edgecolor=self.stair_color,
-                    facecolor=self.stair_color,
-                    alpha=0.6
-                )
-                ax.add_patch(tread_rect)
+        # Stair treads as one (N, 4, 2) array of rectangle corners
+        tread_ys = start_y + np.arange(num_treads) * self.stair_tread_depth
+        tread_ys = tread_ys[tread_ys + self.stair_tread_depth <= room.y_position + room.width * 0.9]
+        if len(tread_ys):
+            x0, x1 = start_x, start_x + stair_width
+            y0, y1 = tread_ys, tread_ys + self.stair_tread_depth * 0.8
+            verts = np.stack([
+                np.column_stack([np.full_like(y0, x0), y0]),
+                np.column_stack([np.full_like(y0, x1), y0]),
+                np.column_stack([np.full_like(y0, x1), y1]),
+                np.column_stack([np.full_like(y0, x0), y1]),
+            ], axis=1)
+            layers.fixture_collections.append(PolyCollection(
+                verts, linewidths=1, edgecolors=self.stair_color,
+                facecolors=self.stair_color, alpha=0.6
+            ))
         
         # Add direction arrow
         arrow_start_x = start_x + stair_width / 2
@@ -289,7 +368,7 @@ class CADRenderer:
                ha='left', va='center', fontsize=self.area_fontsize,
                fontweight='bold', color=self.stair_color)
     
-    def _draw_bathroom_fixtures(self, ax, room: RoomDimensions):
+    def _draw_bathroom_fixtures(self, ax, layers: _RoomLayers, room: RoomDimensions):
         """Draw bathroom fixtures."""
         # Toilet (small rectangle in corner)
         toilet_size = 1.5
@@ -300,16 +379,16 @@ class CADRenderer:
             (toilet_x, toilet_y), toilet_size, toilet_size,
             linewidth=1, edgecolor='black', facecolor='white'
         )
-        ax.add_patch(toilet_rect)
+        layers.fixture_patches.append(toilet_rect)
         
         # Washbasin (circle)
         basin_x = room.x_position + 1.5
         basin_y = room.y_position + room.width - 1.5
         basin_circle = Circle((basin_x, basin_y), 0.7, 
                             linewidth=1, edgecolor='black', facecolor='lightblue', alpha=0.5)
-        ax.add_patch(basin_circle)
+        layers.fixture_patches.append(basin_circle)
     
-    def _draw_kitchen_elements(self, ax, room: RoomDimensions):
+    def _draw_kitchen_elements(self, ax, layers: _RoomLayers, room: RoomDimensions):
         """Draw kitchen elements."""
         # Kitchen counter (L-shaped or straight)
         counter_width = 2.0
@@ -320,7 +399,7 @@ class CADRenderer:
             room.length - 1.0, counter_width,
             linewidth=1, edgecolor='brown', facecolor='burlywood', alpha=0.7
         )
-        ax.add_patch(counter_rect)
+        layers.fixture_patches.append(counter_rect)
         
         # Side counter if room is large enough
         if room.width > 8:
@@ -329,9 +408,9 @@ class CADRenderer:
                 counter_width, room.width - 1.0,
                 linewidth=1, edgecolor='brown', facecolor='burlywood', alpha=0.7
             )
-            ax.add_patch(side_counter_rect)
+            layers.fixture_patches.append(side_counter_rect)
     
-    def _draw_balcony_elements(self, ax, room: RoomDimensions):
+    def _draw_balcony_elements(self, ax, layers: _RoomLayers, room: RoomDimensions):
         """Draw balcony elements."""
         # Balcony railing (dashed line along open edge)
         # Assuming balcony opens to the front (adjust based on orientation)
@@ -340,38 +419,16 @@ class CADRenderer:
                [railing_y, railing_y], 
                linestyle='--', linewidth=2, color='gray', alpha=0.8)
         
-        # Add small plants or decorative elements
-        for i in range(int(room.length / 4)):
-            plant_x = room.x_position + (i + 1) * room.length / (int(room.length / 4) + 1)
-            plant_y = room.y_position + room.width / 2
-            plant_circle = Circle((plant_x, plant_y), 0.3, 
-                                linewidth=1, edgecolor='green', facecolor='lightgreen', alpha=0.6)
-            ax.add_patch(plant_circle)
-    
-    def _add_professional_room_labels(self, ax, room: RoomDimensions, room_name: str):
-        """Add professional room labels with dimensions and area."""
-        room_area = room.length * room.width
-        center_x = room.x_position + room.length / 2
-        center_y = room.y_position + room.width / 2
-        
-        # Clean room name
-        clean_name = room_name.replace('_', ' ').title()
-        
-        # Room name (bold, larger)
-        ax.text(center_x, center_y + 1.2, clean_name,
-               ha='center', va='center', fontsize=self.room_label_fontsize,
-               fontweight='bold', color=self.text_color)
-        
-        # Room dimensions
-        ax.text(center_x, center_y, f"{room.length:.1f}' × {room.width:.1f}'",
-               ha='center', va='center', fontsize=self.area_fontsize,
-               color=self.text_color, style='italic')
-        
-        # Room area
-        ax.text(center_x, center_y - 1.2, f"{room_area:.0f} sq.ft",
-               ha='center', va='center', fontsize=self.area_fontsize,
-               color=self.text_color, bbox=dict(boxstyle="round,pad=0.3", 
-               facecolor='white', edgecolor='gray', alpha=0.9))
+        # Add small plants or decorative elements, evenly spaced along the middle
+        num_plants = int(room.length / 4)
+        if num_plants:
+            plant_xs = room.x_position + np.arange(1, num_plants + 1) * room.length / (num_plants + 1)
+            plant_ys = np.full(num_plants, room.y_position + room.width / 2)
+            # Diameters in data units, like the Circle patches this replaces
+            plants = EllipseCollection(0.6, 0.6, 0, units='xy', offsets=np.column_stack([plant_xs, plant_ys]),
+                                       offset_transform=ax.transData, linewidths=1, edgecolors='green',
+                                       facecolors='lightgreen', alpha=0.6)
+            layers.fixture_collections.append(plants)
     
     def _draw_doors_windows_professional(self, ax, doors_windows: List[DoorWindow]):
         """Draw doors and windows with professional symbols."""
@@ -381,6 +438,22 @@ class CADRenderer:
             elif item.type.lower() == 'window':
                 self._draw_window_symbol(ax, item)
     
+    def _door_arc(self, door: DoorWindow, center: Tuple[float, float]) -> patches.Arc:
+        """Return a 90-degree door swing arc for the door's width and wall, centred at center."""
+        wall_direction = door.wall.lower()
+        key = (round(door.width, 2), wall_direction)
+        cached = self._arc_cache.get(key)
+        if cached is None:
+            swing_radius = door.width * 0.9
+            angle = {'north': 0, 'south': 180, 'east': 90}.get(wall_direction, 270)
+            cached = patches.Arc((0, 0), swing_radius * 2, swing_radius * 2,
+                                 angle=angle, theta1=0, theta2=90,
+                                 linewidth=2, color=self.door_color)
+            self._arc_cache[key] = cached
+        arc = copy.copy(cached)
+        arc.set_center(center)
+        return arc
+    
     def _draw_door_symbol(self, ax, door: DoorWindow):
         """Draw professional door symbol with proper swing representation."""
         # Door opening (gap in wall) - more realistic representation
@@ -398,17 +471,10 @@ class CADRenderer:
             ax.add_patch(door_opening)
             
             # Door swing arc (90-degree swing)
-            swing_radius = door.width * 0.9
             if wall_direction == 'north':
-                arc = patches.Arc((door.x_position - door.width/2, door.y_position), 
-                                swing_radius * 2, swing_radius * 2,
-                                angle=0, theta1=0, theta2=90,
-                                linewidth=2, color=self.door_color)
+                arc = self._door_arc(door, (door.x_position - door.width/2, door.y_position))
             else:  # south
-                arc = patches.Arc((door.x_position + door.width/2, door.y_position), 
-                                swing_radius * 2, swing_radius * 2,
-                                angle=180, theta1=0, theta2=90,
-                                linewidth=2, color=self.door_color)
+                arc = self._door_arc(door, (door.x_position + door.width/2, door.y_position))
         else:
             # Vertical door opening
             door_opening = Rectangle(
@@ -421,17 +487,10 @@ class CADRenderer:
             ax.add_patch(door_opening)
             
             # Door swing arc
-            swing_radius = door.width * 0.9
             if wall_direction == 'east':
-                arc = patches.Arc((door.x_position, door.y_position - door.width/2), 
-                                swing_radius * 2, swing_radius * 2,
-                                angle=90, theta1=0, theta2=90,
-                                linewidth=2, color=self.door_color)
+                arc = self._door_arc(door, (door.x_position, door.y_position - door.width/2))
             else:  # west
-                arc = patches.Arc((door.x_position, door.y_position + door.width/2), 
-                                swing_radius * 2, swing_radius * 2,
-                                angle=270, theta1=0, theta2=90,
-                                linewidth=2, color=self.door_color)
+                arc = self._door_arc(door, (door.x_position, door.y_position + door.width/2))
         
         ax.add_patch(arc)
         
@@ -450,10 +509,10 @@ class CADRenderer:
     def _draw_window_symbol(self, ax, window: DoorWindow):
         """Draw professional window symbol with proper frame representation."""
         wall_direction = window.wall.lower()
+        horizontal = wall_direction in ['north', 'south']
         
-        if wall_direction in ['north', 'south']:
-            # Horizontal window
-            # Window opening in wall
+        # Window opening in wall
+        if horizontal:
             window_opening = Rectangle(
                 (window.x_position - window.width/2, window.y_position - self.wall_thickness/2),
                 window.width, self.wall_thickness,
@@ -461,27 +520,7 @@ class CADRenderer:
                 facecolor='lightblue',
                 alpha=0.3
             )
-            ax.add_patch(window_opening)
-            
-            # Window frame (double lines for glass)
-            frame_offset = self.wall_thickness * 0.2
-            ax.plot([window.x_position - window.width/2, window.x_position + window.width/2],
-                   [window.y_position - frame_offset, window.y_position - frame_offset],
-                   linewidth=2, color=self.window_color)
-            ax.plot([window.x_position - window.width/2, window.x_position + window.width/2],
-                   [window.y_position + frame_offset, window.y_position + frame_offset],
-                   linewidth=2, color=self.window_color)
-            
-            # Window mullions (vertical dividers)
-            num_panels = max(1, int(window.width / 3))
-            for i in range(1, num_panels):
-                mullion_x = window.x_position - window.width/2 + i * (window.width / num_panels)
-                ax.plot([mullion_x, mullion_x],
-                       [window.y_position - frame_offset, window.y_position + frame_offset],
-                       linewidth=1, color=self.window_color, alpha=0.7)
         else:
-            # Vertical window
-            # Window opening in wall
             window_opening = Rectangle(
                 (window.x_position - self.wall_thickness/2, window.y_position - window.width/2),
                 self.wall_thickness, window.width,
@@ -489,99 +528,108 @@ class CADRenderer:
                 facecolor='lightblue',
                 alpha=0.3
             )
-            ax.add_patch(window_opening)
-            
-            # Window frame (double lines for glass)
-            frame_offset = self.wall_thickness * 0.2
-            ax.plot([window.x_position - frame_offset, window.x_position - frame_offset],
-                   [window.y_position - window.width/2, window.y_position + window.width/2],
-                   linewidth=2, color=self.window_color)
-            ax.plot([window.x_position + frame_offset, window.x_position + frame_offset],
-                   [window.y_position - window.width/2, window.y_position + window.width/2],
-                   linewidth=2, color=self.window_color)
-            
-            # Window mullions (horizontal dividers)
-            num_panels = max(1, int(window.width / 3))
-            for i in range(1, num_panels):
-                mullion_y = window.y_position - window.width/2 + i * (window.width / num_panels)
-                ax.plot([window.x_position - frame_offset, window.x_position + frame_offset],
-                       [mullion_y, mullion_y],
-                       linewidth=1, color=self.window_color, alpha=0.7)
+        ax.add_patch(window_opening)
+        
+        # Frame (double lines for glass) and mullions, worked out along (a) and
+        # across (c) the wall, then emitted as a single LineCollection
+        frame_offset = self.wall_thickness * 0.2
+        if horizontal:
+            along, across = window.x_position, window.y_position
+        else:
+            along, across = window.y_position, window.x_position
+        start, end = along - window.width/2, along + window.width/2
+        
+        num_panels = max(1, int(window.width / 3))
+        mullions = np.linspace(start, end, num_panels + 1)[1:-1]
+        
+        frames = np.array([[[start, across - frame_offset], [end, across - frame_offset]],
+                           [[start, across + frame_offset], [end, across + frame_offset]]])
+        mullion_segments = np.stack([
+            np.column_stack([mullions, np.full_like(mullions, across - frame_offset)]),
+            np.column_stack([mullions, np.full_like(mullions, across + frame_offset)]),
+        ], axis=1)
+        segments = np.concatenate([frames, mullion_segments])
+        if not horizontal:
+            # Swap (a, c) to (x, y) for windows on east/west walls
+            segments = segments[..., ::-1]
+        
+        colors = [to_rgba(self.window_color)] * 2 + [to_rgba(self.window_color, 0.7)] * len(mullions)
+        linewidths = [2] * 2 + [1] * len(mullions)
+        ax.add_collection(LineCollection(segments, colors=colors, linewidths=linewidths, capstyle='projecting'))
     
-    def _add_professional_dimensions(self, ax, rooms: Dict[str, RoomDimensions], 
+    def _add_professional_dimensions(self, ax, room_arr: np.ndarray, 
                                    building_length: float, building_width: float):
         """Add professional dimension lines with arrows and measurements."""
+        dimensions = []
         
         # Overall building dimensions
         # Bottom dimension (total length)
         y_pos = -self.dimension_offset
-        self._draw_dimension_line(ax, 0, y_pos, building_length, y_pos, f"{building_length:.1f}'")
+        dimensions.append(self._dimension_line_parts(0, y_pos, building_length, y_pos, f"{building_length:.1f}'"))
         
         # Left dimension (total width)
         x_pos = -self.dimension_offset
-        self._draw_dimension_line(ax, x_pos, 0, x_pos, building_width, f"{building_width:.1f}'", vertical=True)
+        dimensions.append(self._dimension_line_parts(x_pos, 0, x_pos, building_width, f"{building_width:.1f}'", vertical=True))
         
         # Individual room dimensions (sample for major rooms)
-        for room_name, room in rooms.items():
-            if 'living' in room_name.lower() or 'bedroom' in room_name.lower() or 'kitchen' in room_name.lower():
-                # Room length dimension (top)
-                y_pos = room.y_position + room.width + 1.0
-                x_start = room.x_position
-                x_end = room.x_position + room.length
-                self._draw_dimension_line(ax, x_start, y_pos, x_end, y_pos, f"{room.length:.1f}'")
-                
-                # Room width dimension (right)
-                x_pos = room.x_position + room.length + 1.0
-                y_start = room.y_position
-                y_end = room.y_position + room.width
-                self._draw_dimension_line(ax, x_pos, y_start, x_pos, y_end, f"{room.width:.1f}'", vertical=True)
-    
-    def _draw_dimension_line(self, ax, x1: float, y1: float, x2: float, y2: float, 
-                           text: str, vertical: bool = False):
-        """Draw a professional dimension line with arrows and text."""
-        # Main dimension line
-        ax.plot([x1, x2], [y1, y2], color=self.dimension_color, linewidth=1.0)
-        
-        # Extension lines
-        if vertical:
-            # Vertical dimension
-            ax.plot([x1 - self.dimension_extension/2, x1 + self.dimension_extension/2], 
-                   [y1, y1], color=self.dimension_line_color, linewidth=0.8)
-            ax.plot([x2 - self.dimension_extension/2, x2 + self.dimension_extension/2], 
-                   [y2, y2], color=self.dimension_line_color, linewidth=0.8)
+        major = room_arr[np.isin(room_arr['type'], _DIMENSIONED_TYPES)]
+        x_starts, y_starts = major['x'], major['y']
+        x_ends = x_starts + major['l']
+        y_ends = y_starts + major['w']
+        for x_start, y_start, x_end, y_end, length, width in zip(
+                x_starts, y_starts, x_ends, y_ends, major['l'], major['w']):
+            # Room length dimension (top)
+            y_pos = y_end + 1.0
+            dimensions.append(self._dimension_line_parts(x_start, y_pos, x_end, y_pos, f"{length:.1f}'"))
             
-            # Text
-            mid_y = (y1 + y2) / 2
-            ax.text(x1 - 0.5, mid_y, text, ha='center', va='center', 
+            # Room width dimension (right)
+            x_pos = x_end + 1.0
+            dimensions.append(self._dimension_line_parts(x_pos, y_start, x_pos, y_end, f"{width:.1f}'", vertical=True))
+        
+        # One LineCollection for every dimension and extension line, one
+        # PatchCollection for every arrowhead, then the labels
+        segments = np.concatenate([parts[0] for parts in dimensions])
+        colors = [self.dimension_color, self.dimension_line_color, self.dimension_line_color] * len(dimensions)
+        linewidths = [1.0, 0.8, 0.8] * len(dimensions)
+        ax.add_collection(LineCollection(segments, colors=colors, linewidths=linewidths, capstyle='projecting',
+                                         rasterized=True))
+        
+        arrows = [arrow for parts in dimensions for arrow in parts[1]]
+        ax.add_collection(PatchCollection(arrows, facecolor=self.dimension_color, edgecolor=self.dimension_color))
+        
+        for _, _, (text_x, text_y, text, rotation) in dimensions:
+            ax.text(text_x, text_y, text, ha='center', va='center', 
                    fontsize=self.dimension_fontsize, color=self.dimension_color,
-                   rotation=90, fontweight='bold')
-        else:
-            # Horizontal dimension
-            ax.plot([x1, x1], [y1 - self.dimension_extension/2, y1 + self.dimension_extension/2], 
-                   color=self.dimension_line_color, linewidth=0.8)
-            ax.plot([x2, x2], [y2 - self.dimension_extension/2, y2 + self.dimension_extension/2], 
-                   color=self.dimension_line_color, linewidth=0.8)
-            
-            # Text
-            mid_x = (x1 + x2) / 2
-            ax.text(mid_x, y1 - 0.5, text, ha='center', va='center', 
-                   fontsize=self.dimension_fontsize, color=self.dimension_color,
-                   fontweight='bold')
+                   rotation=rotation, fontweight='bold')
+    
+    def _dimension_line_parts(self, x1: float, y1: float, x2: float, y2: float, 
+                              text: str, vertical: bool = False):
+        """
+        Geometry for one dimension line.
         
-        # Arrow heads
+        Returns (segments, arrowheads, label): a (3, 2, 2) array holding the
+        main line then its two extension lines, two FancyArrow patches, and
+        the label as (x, y, text, rotation).
+        """
+        half_ext = self.dimension_extension / 2
         arrow_length = self.arrow_size
         if vertical:
-            # Vertical arrows
-            ax.arrow(x1, y1, 0, arrow_length, head_width=0.2, head_length=0.2, 
-                    fc=self.dimension_color, ec=self.dimension_color)
-            ax.arrow(x2, y2, 0, -arrow_length, head_width=0.2, head_length=0.2, 
-                    fc=self.dimension_color, ec=self.dimension_color)
+            # Vertical dimension
+            segments = np.array([[[x1, y1], [x2, y2]],
+                                 [[x1 - half_ext, y1], [x1 + half_ext, y1]],
+                                 [[x2 - half_ext, y2], [x2 + half_ext, y2]]])
+            arrows = [patches.FancyArrow(x1, y1, 0, arrow_length, head_width=0.2, head_length=0.2),
+                      patches.FancyArrow(x2, y2, 0, -arrow_length, head_width=0.2, head_length=0.2)]
+            label = (x1 - 0.5, (y1 + y2) / 2, text, 90)
         else:
-            # Horizontal arrows
-            ax.arrow(x1, y1, arrow_length, 0, head_width=0.2, head_length=0.2, 
-                    fc=self.dimension_color, ec=self.dimension_color)
-            ax.arrow(x2, y2, -arrow_length, 0, head_width=0.2, head_length=0.2, 
-                    fc=self.dimension_color, ec=self.dimension_color)
+            # Horizontal dimension
+            segments = np.array([[[x1, y1], [x2, y2]],
+                                 [[x1, y1 - half_ext], [x1, y1 + half_ext]],
+                                 [[x2, y2 - half_ext], [x2, y2 + half_ext]]])
+            arrows = [patches.FancyArrow(x1, y1, arrow_length, 0, head_width=0.2, head_length=0.2),
+                      patches.FancyArrow(x2, y2, -arrow_length, 0, head_width=0.2, head_length=0.2)]
+            label = ((x1 + x2) / 2, y1 - 0.5, text, 0)
+        return segments, arrows, label
     
     def _add_professional_title_block(self, ax, title: str, floor_plan: FloorPlan, 
                                     building_length: float, building_width: float, total_area: float):
@@ -595,39 +643,25 @@ class CADRenderer:
         # Main title block rectangle with professional border
         title_rect = Rectangle(
             (title_x, title_y), title_width, title_height,
-            linewidth=2.5,
-            edgecolor=self.text_color,
-            facecolor=self.title_box_color,
-            alpha=0.95
+            **self._title_rect_style
         )
         ax.add_patch(title_rect)
         
         # Inner border for professional look
         inner_rect = Rectangle(
             (title_x + 0.3, title_y + 0.3), title_width - 0.6, title_height - 0.6,
-            linewidth=1,
-            edgecolor=self.text_color,
-            facecolor='none'
+            **self._title_inner_rect_style
         )
         ax.add_patch(inner_rect)
         
         # Title header
         ax.text(title_x + title_width/2, title_y + title_height - 1.5, "Architectural Floor Plan",
-               ha='center', va='center', fontsize=self.title_fontsize, 
-               fontweight='bold', color=self.text_color)
+               **self._title_kwargs)
         
         # Floor information with professional naming
-        floor_names = {
-            0: "Ground Floor",
-            1: "First Floor", 
-            2: "Second Floor",
-            3: "Third Floor"
-        }
-        floor_text = floor_names.get(floor_plan.floor_number, f"Floor {floor_plan.floor_number + 1}")
+        floor_text = self._FLOOR_NAMES.get(floor_plan.floor_number, f"Floor {floor_plan.floor_number + 1}")
         ax.text(title_x + title_width/2, title_y + title_height - 3, floor_text,
-               ha='center', va='center', fontsize=self.subtitle_fontsize, 
-               fontweight='bold', color=self.text_color,
-               bbox=dict(boxstyle="round,pad=0.3", facecolor='yellow', alpha=0.4))
+               **self._floor_kwargs)
         
         # Building specifications in organized rows
         specs_start_y = title_y + title_height - 5
@@ -635,54 +669,58 @@ class CADRenderer:
         
         # Building dimensions
         ax.text(title_x + 1, specs_start_y, f"Building Size: {building_length:.1f}' × {building_width:.1f}'",
-               ha='left', va='center', fontsize=self.label_fontsize, color=self.text_color)
+               **self._spec_kwargs)
         
         # Total area
         ax.text(title_x + 1, specs_start_y - line_height, f"Total Area: {total_area:.0f} sq.ft",
-               ha='left', va='center', fontsize=self.label_fontsize, color=self.text_color)
+               **self._spec_kwargs)
         
         # Room count
         room_count = len(floor_plan.rooms)
         ax.text(title_x + 1, specs_start_y - 2*line_height, f"Rooms: {room_count}",
-               ha='left', va='center', fontsize=self.label_fontsize, color=self.text_color)
+               **self._spec_kwargs)
         
         # Scale information
         ax.text(title_x + 1, specs_start_y - 3*line_height, "Scale: 1\" = 1'",
-               ha='left', va='center', fontsize=self.label_fontsize, color=self.text_color)
+               **self._spec_kwargs)
         
         # Date
-        from datetime import datetime
         date_str = datetime.now().strftime("%m/%d/%Y")
         ax.text(title_x + 1, specs_start_y - 4*line_height, f"Date: {date_str}",
-               ha='left', va='center', fontsize=self.area_fontsize, color=self.text_color)
+               **self._date_kwargs)
         
         # Professional compass rose (top-left)
         north_x, north_y = 4, building_width + 8
         self._draw_professional_compass_rose(ax, north_x, north_y)
     
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _compass_paths() -> Tuple[MplPath, MplPath, MplPath, MplPath]:
+        """
+        Compass rose geometry centred on the origin: (outer circle with east and
+        west indicators, inner circle, north arrow, south arrow).
+        """
+        ticks = MplPath([(1.5, 0), (2.2, 0), (-1.5, 0), (-2.2, 0)],
+                        [MplPath.MOVETO, MplPath.LINETO, MplPath.MOVETO, MplPath.LINETO])
+        heavy = MplPath.make_compound_path(MplPath.circle((0, 0), 2.5), ticks)
+        light = MplPath.circle((0, 0), 1.8)
+        north = MplPath([(0, 2.2), (-0.3, 1.5), (0, 1.8), (0.3, 1.5), (0, 2.2)], closed=True)
+        south = MplPath([(0, -2.2), (-0.2, -1.5), (0, -1.8), (0.2, -1.5), (0, -2.2)], closed=True)
+        return heavy, light, north, south
+    
     def _draw_professional_compass_rose(self, ax, x: float, y: float):
         """Draw professional compass rose matching industry standards."""
-        # Outer circle
-        outer_circle = Circle((x, y), 2.5, fill=False, edgecolor='black', linewidth=2)
-        ax.add_patch(outer_circle)
-        
-        # Inner circle
-        inner_circle = Circle((x, y), 1.8, fill=False, edgecolor='black', linewidth=1)
-        ax.add_patch(inner_circle)
-        
-        # North arrow (main)
-        north_points = np.array([[x, y + 2.2], [x - 0.3, y + 1.5], [x, y + 1.8], [x + 0.3, y + 1.5]])
-        north_arrow = patches.Polygon(north_points, closed=True, facecolor='black', edgecolor='black')
-        ax.add_patch(north_arrow)
-        
-        # South arrow (smaller)
-        south_points = np.array([[x, y - 2.2], [x - 0.2, y - 1.5], [x, y - 1.8], [x + 0.2, y - 1.5]])
-        south_arrow = patches.Polygon(south_points, closed=True, facecolor='white', edgecolor='black')
-        ax.add_patch(south_arrow)
-        
-        # East and West indicators
-        ax.plot([x + 1.5, x + 2.2], [y, y], linewidth=2, color='black')
-        ax.plot([x - 1.5, x - 2.2], [y, y], linewidth=2, color='black')
+        # Fixed geometry built once around the origin, moved into place here
+        heavy, light, north, south = self._compass_paths()
+        transform = Affine2D().translate(x, y) + ax.transData
+        
+        # Outer circle with east/west indicators, inner circle, then the filled
+        # north arrow and hollow south arrow, all as a single collection
+        ax.add_collection(PathCollection([heavy, light, north, south], transform=transform,
+                                         facecolors=['none', 'none', 'black', 'white'],
+                                         edgecolors='black', linewidths=[2, 1, 1, 1],
+                                         capstyle='projecting', joinstyle='miter'),
+                          autolim=False)
         
         # Cardinal direction labels
         ax.text(x, y + 3.2, 'N', ha='center', va='center', 
@@ -693,56 +731,3 @@ class CADRenderer:
                fontsize=self.label_fontsize, fontweight='bold')
         ax.text(x - 3.2, y, 'W', ha='center', va='center', 
                fontsize=self.label_fontsize, fontweight='bold')
-    
-    def _draw_north_arrow(self, ax, x: float, y: float):
-        """Draw simple north arrow (legacy method)."""
-        # Arrow shaft
-        ax.arrow(x, y, 0, 2, head_width=0.3, head_length=0.3, 
-                fc='black', ec='black', linewidth=2)
-        
-        # "N" label
-        ax.text(x, y + 2.8, 'N', ha='center', va='center', 
-               fontsize=self.label_fontsize, fontweight='bold')
-        
-        # Circle
-        circle = Circle((x, y + 1), 0.8, fill=False, edgecolor='black', linewidth=1.5)
-        ax.add_patch(circle)
-    
-    def _apply_professional_styling(self, ax, building_length: float, building_width: float):
-        """Apply professional architectural drawing styling."""
-        # Set limits with margins for dimensions
-        margin = 5
-        ax.set_xlim(-margin, building_length + margin)
-        ax.set_ylim(-margin, building_width + margin + 10)  # Extra space for title block
-        
-        # Equal aspect ratio
-        ax.set_aspect('equal')
-        
-        # Remove axes for clean look
-        ax.set_xticks([])
-        ax.set_yticks([])
-        
-        # Clean spines
-        for spine in ax.spines.values():
-            spine.set_visible(False)
-        
-        # White background
-        ax.set_facecolor('white')
-    
-    def _save_and_encode(self, fig, output_path: Optional[str]) -> str:
-        """Save figure and return base64 encoded string."""
-        # Save to file if path provided
-        if output_path:
-            fig.savefig(output_path, dpi=300, bbox_inches='tight', 
-                       facecolor='white', edgecolor='none', format='png')
-        
-        # Convert to base64 for web display
-        buffer = io.BytesIO()
-        fig.savefig(buffer, format='png', dpi=300, bbox_inches='tight',
-                   facecolor='white', edgecolor='none')
-        buffer.seek(0)
-        image_base64 = base64.b64encode(buffer.getvalue()).decode()
-        
-        plt.close(fig)
-        
-        return image_base64
@@ -3,14 +3,13 @@ Professional Architect's Blueprint Renderer for architectural designs.
 Creates certified architect-quality floor plans with proper dimensions and labels.
 """
 
-import matplotlib.pyplot as plt
 import matplotlib.patches as patches
-from matplotlib.patches import Rectangle, FancyBboxPatch, Circle, Arrow, FancyArrowPatch
+from matplotlib.patches import Rectangle, FancyBboxPatch, Circle, Arrow, FancyArrow, FancyArrowPatch
+from matplotlib.collections import LineCollection, PolyCollection
 import numpy as np
 from typing import Dict, List, Tuple, Optional
-import io
-import base64
 import math
+from datetime import datetime
 
 import sys
 from pathlib import Path
@@ -20,23 +19,52 @@ current_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(current_dir))
 
 from architectural_engine.schemas import FloorPlan, RoomDimensions, DoorWindow
+from ._cad_base import _CADRendererBase, njit
 
-class CADRenderer:
+@njit(cache=True)
+def _build_dim_segments(x, y, l, w, mask, offset):
+    """
+    Room dimension lines for the rooms selected by mask, in order: an (n, 2, 2)
+    array of length lines above each room and one of width lines to its right,
+    both offset from the walls.
+    """
+    n = 0
+    for i in range(mask.shape[0]):
+        if mask[i]:
+            n += 1
+    top = np.empty((n, 2, 2), np.float64)
+    right = np.empty((n, 2, 2), np.float64)
+    j = 0
+    for i in range(mask.shape[0]):
+        if mask[i]:
+            top[j, 0, 0] = x[i]
+            top[j, 0, 1] = y[i] + w[i] + offset
+            top[j, 1, 0] = x[i] + l[i]
+            top[j, 1, 1] = y[i] + w[i] + offset
+            right[j, 0, 0] = x[i] + l[i] + offset
+            right[j, 0, 1] = y[i]
+            right[j, 1, 0] = x[i] + l[i] + offset
+            right[j, 1, 1] = y[i] + w[i]
+            j += 1
+    return top, right
+
+class _DimensionLines:
+    """Dimension geometry queued during one render, drawn as one collection per kind."""
+    
+    def __init__(self):
+        self.segments = []
+        self.ticks = []
+        self.arrows = []
+
+class CADRenderer(_CADRendererBase):
     """Renders professional architect-quality 2D floor plans with proper dimensions and labels."""
     
     def __init__(self):
+        super().__init__()
+        
         # Professional Blueprint styling parameters
-        self.wall_color = '#000000'  # Black walls for professional look
         self.wall_linewidth = 2.5
-        self.room_fill_color = '#FFFFFF'  # White interior
-        self.room_edge_color = '#000000'
-        self.dimension_color = '#FF0000'  # Red dimensions (standard)
-        self.dimension_line_color = '#000000'
-        self.text_color = '#000000'
         self.grid_color = '#E0E0E0'  # Light grid
-        self.door_color = '#8B4513'  # Brown doors
-        self.window_color = '#4169E1'  # Blue windows
-        self.title_box_color = '#F0F8FF'
         
         # Professional font settings
         self.title_fontsize = 14
@@ -51,6 +79,21 @@ class CADRenderer:
         self.dimension_extension = 1.5  # Extension line length
         self.arrow_size = 0.4
         
+        # The outline ax.arrow would build for an arrow pointing along +x from the origin
+        self._arrow_unit = FancyArrow(0, 0, self.arrow_size, 0, head_width=0.2, head_length=0.2).get_xy()
+        
+        # Title block text styles
+        self._title_kwargs = dict(ha='center', va='center', fontsize=self.title_fontsize,
+                                  fontweight='bold', color=self.text_color)
+        self._subtitle_kwargs = dict(ha='center', va='center', fontsize=self.subtitle_fontsize,
+                                     color=self.text_color)
+        self._spec_kwargs = dict(ha='center', va='center', fontsize=self.label_fontsize, color=self.text_color)
+        self._date_kwargs = dict(ha='center', va='center', fontsize=self.area_fontsize, color=self.text_color)
+        
+        # Quarter circle (0 to 90 degrees) of unit radius, scaled and flipped per door swing
+        theta = np.linspace(0, np.pi / 2, 24)
+        self._arc_unit = np.column_stack([np.cos(theta), np.sin(theta)])
+        
     def render_floor_plan(self, floor_plan: FloorPlan, title: str = "Architectural Floor Plan", 
                          show_dimensions: bool = True, show_grid: bool = True,
                          output_path: Optional[str] = None) -> str:
@@ -76,23 +119,23 @@ class CADRenderer:
         fig_width = max(16, building_length * 0.25)
         fig_height = max(12, building_width * 0.25)
         
-        fig, ax = plt.subplots(1, 1, figsize=(fig_width, fig_height))
-        fig.patch.set_facecolor('white')
+        fig, ax = self._prepare_canvas(fig_width, fig_height)
         
         # Add professional grid
         if show_grid:
             self._add_professional_grid(ax, building_length, building_width)
         
         # Draw rooms with professional styling
-        self._draw_rooms_professional(ax, floor_plan.rooms)
+        rooms = self._rooms_to_soa(floor_plan.rooms)
+        self._draw_rooms_professional(ax, *rooms)
         
         # Draw doors and windows
-        if hasattr(floor_plan, 'doors_windows') and floor_plan.doors_windows:
+        if floor_plan.doors_windows:
             self._draw_doors_windows_professional(ax, floor_plan.doors_windows)
         
         # Add professional dimensions
         if show_dimensions:
-            self._add_professional_dimensions(ax, floor_plan.rooms, building_length, building_width)
+            self._add_professional_dimensions(ax, *rooms, building_length, building_width)
         
         # Add professional title block and labels
         self._add_professional_title_block(ax, title, floor_plan, building_length, building_width, total_area)
@@ -100,165 +143,144 @@ class CADRenderer:
         # Set professional styling
         self._apply_professional_styling(ax, building_length, building_width)
         
-        # Save and return
-        return self._save_and_encode(fig, output_path)
+        # Save and return; only identical plans drawn with the same options share a crop box
+        layout_key = self._layout_key(floor_plan, title, show_dimensions, show_grid)
+        return self._save_and_encode(fig, output_path, layout_key)
     
-    def _add_professional_grid(self, ax, building_length: float, building_width: float):
-        """Add professional architectural grid."""
-        # Major grid lines every 5 feet (thick)
-        major_x = np.arange(0, building_length + 5, 5)
-        major_y = np.arange(0, building_width + 5, 5)
-        
-        for x in major_x:
-            ax.axvline(x, color=self.grid_color, linewidth=0.8, alpha=0.7)
-        for y in major_y:
-            ax.axhline(y, color=self.grid_color, linewidth=0.8, alpha=0.7)
-        
-        # Minor grid lines every 1 foot (thin)
-        minor_x = np.arange(0, building_length + 1, 1)
-        minor_y = np.arange(0, building_width + 1, 1)
-        
-        for x in minor_x:
-            ax.axvline(x, color=self.grid_color, linewidth=0.3, alpha=0.5)
-        for y in minor_y:
-            ax.axhline(y, color=self.grid_color, linewidth=0.3, alpha=0.5)
+    @staticmethod
+    def _rooms_to_soa(rooms: Dict[str, RoomDimensions]):
+        """Split rooms into (names, x, y, lengths, widths), one array per field, in dict order."""
+        names = list(rooms)
+        geometry = np.array([[room.x_position, room.y_position, room.length, room.width]
+                             for room in rooms.values()], dtype=np.float64).reshape(-1, 4)
+        x, y, lengths, widths = (np.ascontiguousarray(column) for column in geometry.T)
+        return names, x, y, lengths, widths
     
-    def _draw_rooms_professional(self, ax, rooms: Dict[str, RoomDimensions]):
+    def _draw_rooms_professional(self, ax, names: List[str], x: np.ndarray, y: np.ndarray,
+                                 lengths: np.ndarray, widths: np.ndarray):
         """Draw rooms with professional architectural styling."""
-        for room_name, room in rooms.items():
-            # Draw room rectangle with thick walls
-            rect = Rectangle(
-                (room.x_position, room.y_position),
-                room.length, room.width,
-                linewidth=self.wall_linewidth,
-                edgecolor=self.wall_color,
-                facecolor=self.room_fill_color,
-                alpha=0.9
-            )
-            ax.add_patch(rect)
-            
-            # Add room label with area
-            room_area = room.length * room.width
-            center_x = room.x_position + room.length / 2
-            center_y = room.y_position + room.width / 2
-            
-            # Room name (bold, larger)
-            ax.text(center_x, center_y + 0.8, room_name.replace('_', ' ').title(),
-                   ha='center', va='center', fontsize=self.room_label_fontsize,
-                   fontweight='bold', color=self.text_color)
-            
-            # Room dimensions
-            ax.text(center_x, center_y, f"{room.length:.1f}' × {room.width:.1f}'",
-                   ha='center', va='center', fontsize=self.area_fontsize,
-                   color=self.text_color, style='italic')
-            
-            # Room area
-            ax.text(center_x, center_y - 0.8, f"{room_area:.0f} sq.ft",
-                   ha='center', va='center', fontsize=self.area_fontsize,
-                   color=self.text_color, bbox=dict(boxstyle="round,pad=0.2", 
-                   facecolor='white', edgecolor='gray', alpha=0.8))
+        # All room rectangles as one (N, 4, 2) quad array in a single collection
+        quads = np.stack([np.column_stack([x, y]),
+                          np.column_stack([x + lengths, y]),
+                          np.column_stack([x + lengths, y + widths]),
+                          np.column_stack([x, y + widths])], axis=1)
+        ax.add_collection(PolyCollection(quads, linewidths=self.wall_linewidth,
+                                         edgecolors=self.wall_color, facecolors=self.room_fill_color,
+                                         alpha=0.9, joinstyle='miter'), autolim=False)
+        
+        # Label positions for every room at once
+        centers_x = x + lengths / 2
+        centers_y = y + widths / 2
+        
+        labels = [self._room_labels(room_name, float(length), float(width))
+                  for room_name, length, width in zip(names, lengths, widths)]
+        self._draw_room_labels(ax, centers_x, centers_y, labels, line_offset=0.8, box_pad=0.2, box_alpha=0.8)
     
     def _draw_doors_windows_professional(self, ax, doors_windows: List[DoorWindow]):
         """Draw doors and windows with professional symbols."""
+        # The symbol helpers queue geometry here; each kind is drawn as one collection
+        door_openings = []
+        door_arcs = []
+        window_quads = []
+        
         for item in doors_windows:
             if item.type.lower() == 'door':
-                self._draw_door_symbol(ax, item)
+                self._draw_door_symbol(ax, item, door_openings, door_arcs)
             elif item.type.lower() == 'window':
-                self._draw_window_symbol(ax, item)
+                self._draw_window_symbol(ax, item, window_quads)
+        
+        ax.add_collection(PolyCollection(door_openings, linewidths=0, facecolors='white'),
+                          autolim=False)
+        ax.add_collection(LineCollection(door_arcs, colors=self.door_color, linewidths=1.5),
+                          autolim=False)
+        ax.add_collection(PolyCollection(window_quads, linewidths=2, edgecolors=self.window_color,
+                                         facecolors='lightblue', alpha=0.7, joinstyle='miter'),
+                          autolim=False)
+    
+    @staticmethod
+    def _quad(x: float, y: float, width: float, height: float) -> List[Tuple[float, float]]:
+        """Corners of an axis-aligned rectangle, counter-clockwise from (x, y)."""
+        return [(x, y), (x + width, y), (x + width, y + height), (x, y + height)]
     
-    def _draw_door_symbol(self, ax, door: DoorWindow):
-        """Draw professional door symbol."""
+    def _draw_door_symbol(self, ax, door: DoorWindow, openings: list, arcs: list):
+        """Queue professional door symbol geometry."""
         # Door opening (gap in wall)
-        door_rect = Rectangle(
-            (door.x_position - door.width/2, door.y_position - 0.2),
-            door.width, 0.4,
-            linewidth=0,
-            facecolor='white',
-            alpha=1.0
-        )
-        ax.add_patch(door_rect)
-        
-        # Door swing arc
-        if door.wall.lower() in ['north', 'south']:
-            # Horizontal door
-            arc = patches.Arc((door.x_position, door.y_position), 
-                            door.width * 2, door.width * 2,
-                            angle=0, theta1=0, theta2=90,
-                            linewidth=1.5, color=self.door_color)
-        else:
-            # Vertical door
-            arc = patches.Arc((door.x_position, door.y_position), 
-                            door.width * 2, door.width * 2,
-                            angle=90, theta1=0, theta2=90,
-                            linewidth=1.5, color=self.door_color)
-        ax.add_patch(arc)
+        openings.append(self._quad(door.x_position - door.width/2, door.y_position - 0.2,
+                                              door.width, 0.4))
+        
+        # Door swing arc: the first quadrant for horizontal doors, the second
+        # quadrant (turned 90 degrees) for vertical doors
+        sx = 1 if door.wall.lower() in ['north', 'south'] else -1
+        arcs.append(np.column_stack([door.x_position + sx * door.width * self._arc_unit[:, 0],
+                                     door.y_position + door.width * self._arc_unit[:, 1]]))
     
-    def _draw_window_symbol(self, ax, window: DoorWindow):
-        """Draw professional window symbol."""
+    def _draw_window_symbol(self, ax, window: DoorWindow, quads: list):
+        """Queue professional window symbol geometry."""
         # Window opening
         if window.wall.lower() in ['north', 'south']:
             # Horizontal window
-            window_rect = Rectangle(
-                (window.x_position - window.width/2, window.y_position - 0.1),
-                window.width, 0.2,
-                linewidth=2,
-                edgecolor=self.window_color,
-                facecolor='lightblue',
-                alpha=0.7
-            )
+            quad = self._quad(window.x_position - window.width/2, window.y_position - 0.1,
+                              window.width, 0.2)
         else:
             # Vertical window
-            window_rect = Rectangle(
-                (window.x_position - 0.1, window.y_position - window.width/2),
-                0.2, window.width,
-                linewidth=2,
-                edgecolor=self.window_color,
-                facecolor='lightblue',
-                alpha=0.7
-            )
-        ax.add_patch(window_rect)
+            quad = self._quad(window.x_position - 0.1, window.y_position - window.width/2,
+                              0.2, window.width)
+        quads.append(quad)
     
-    def _add_professional_dimensions(self, ax, rooms: Dict[str, RoomDimensions], 
+    def _add_professional_dimensions(self, ax, names: List[str], x: np.ndarray, y: np.ndarray,
+                                   lengths: np.ndarray, widths: np.ndarray,
                                    building_length: float, building_width: float):
         """Add professional dimension lines with arrows and measurements."""
+        # _draw_dimension_line collects line segments and arrowheads here; they are
+        # drawn below as one PolyCollection of arrows and one LineCollection each
+        # for dimension lines and extension ticks
+        lines = _DimensionLines()
         
         # Overall building dimensions
         # Bottom dimension (total length)
         y_pos = -self.dimension_offset
-        self._draw_dimension_line(ax, 0, y_pos, building_length, y_pos, f"{building_length:.1f}'")
+        self._draw_dimension_line(ax, lines, 0, y_pos, building_length, y_pos, f"{building_length:.1f}'")
         
         # Left dimension (total width)
         x_pos = -self.dimension_offset
-        self._draw_dimension_line(ax, x_pos, 0, x_pos, building_width, f"{building_width:.1f}'", vertical=True)
+        self._draw_dimension_line(ax, lines, x_pos, 0, x_pos, building_width, f"{building_width:.1f}'",
+                                  vertical=True)
         
         # Individual room dimensions (sample for major rooms)
-        for room_name, room in rooms.items():
-            if 'living' in room_name.lower() or 'bedroom' in room_name.lower() or 'kitchen' in room_name.lower():
-                # Room length dimension (top)
-                y_pos = room.y_position + room.width + 1.0
-                x_start = room.x_position
-                x_end = room.x_position + room.length
-                self._draw_dimension_line(ax, x_start, y_pos, x_end, y_pos, f"{room.length:.1f}'")
-                
-                # Room width dimension (right)
-                x_pos = room.x_position + room.length + 1.0
-                y_start = room.y_position
-                y_end = room.y_position + room.width
-                self._draw_dimension_line(ax, x_pos, y_start, x_pos, y_end, f"{room.width:.1f}'", vertical=True)
+        is_major = np.array([any(key in room_name.lower() for key in ('living', 'bedroom', 'kitchen'))
+                             for room_name in names], dtype=np.bool_)
+        top, right = _build_dim_segments(x, y, lengths, widths, is_major, 1.0)
+        
+        for (start, end), (r_start, r_end), length, width in zip(top, right, lengths[is_major], widths[is_major]):
+            # Room length dimension (top)
+            self._draw_dimension_line(ax, lines, start[0], start[1], end[0], end[1], f"{length:.1f}'")
+            
+            # Room width dimension (right)
+            self._draw_dimension_line(ax, lines, r_start[0], r_start[1], r_end[0], r_end[1], f"{width:.1f}'",
+                                      vertical=True)
+        
+        ax.add_collection(PolyCollection(lines.arrows, facecolors=self.dimension_color,
+                                         edgecolors=self.dimension_color, joinstyle='miter'),
+                          autolim=False)
+        ax.add_collection(LineCollection(lines.segments, colors=self.dimension_color,
+                                         linewidths=1.0, capstyle='projecting', rasterized=True),
+                          autolim=False)
+        ax.add_collection(LineCollection(lines.ticks, colors=self.dimension_line_color,
+                                         linewidths=0.8, capstyle='projecting', rasterized=True),
+                          autolim=False)
     
-    def _draw_dimension_line(self, ax, x1: float, y1: float, x2: float, y2: float, 
+    def _draw_dimension_line(self, ax, lines: _DimensionLines, x1: float, y1: float, x2: float, y2: float,
                            text: str, vertical: bool = False):
-        """Draw a professional dimension line with arrows and text."""
+        """Draw a professional dimension line with arrows and text; lines are queued for batching."""
         # Main dimension line
-        ax.plot([x1, x2], [y1, y2], color=self.dimension_color, linewidth=1.0)
+        lines.segments.append([(x1, y1), (x2, y2)])
         
         # Extension lines
+        half_ext = self.dimension_extension / 2
         if vertical:
             # Vertical dimension
-            ax.plot([x1 - self.dimension_extension/2, x1 + self.dimension_extension/2], 
-                   [y1, y1], color=self.dimension_line_color, linewidth=0.8)
-            ax.plot([x2 - self.dimension_extension/2, x2 + self.dimension_extension/2], 
-                   [y2, y2], color=self.dimension_line_color, linewidth=0.8)
+            lines.ticks.append([(x1 - half_ext, y1), (x1 + half_ext, y1)])
+            lines.ticks.append([(x2 - half_ext, y2), (x2 + half_ext, y2)])
             
             # Text
             mid_y = (y1 + y2) / 2
@@ -267,10 +289,8 @@ class CADRenderer:
                    rotation=90, fontweight='bold')
         else:
             # Horizontal dimension
-            ax.plot([x1, x1], [y1 - self.dimension_extension/2, y1 + self.dimension_extension/2], 
-                   color=self.dimension_line_color, linewidth=0.8)
-            ax.plot([x2, x2], [y2 - self.dimension_extension/2, y2 + self.dimension_extension/2], 
-                   color=self.dimension_line_color, linewidth=0.8)
+            lines.ticks.append([(x1, y1 - half_ext), (x1, y1 + half_ext)])
+            lines.ticks.append([(x2, y2 - half_ext), (x2, y2 + half_ext)])
             
             # Text
             mid_x = (x1 + x2) / 2
@@ -278,20 +298,16 @@ class CADRenderer:
                    fontsize=self.dimension_fontsize, color=self.dimension_color,
                    fontweight='bold')
         
-        # Arrow heads
-        arrow_length = self.arrow_size
+        # Arrow heads, pointing inward from each end (the +x outline turned to suit)
+        ux, uy = self._arrow_unit[:, 0], self._arrow_unit[:, 1]
         if vertical:
             # Vertical arrows
-            ax.arrow(x1, y1, 0, arrow_length, head_width=0.2, head_length=0.2, 
-                    fc=self.dimension_color, ec=self.dimension_color)
-            ax.arrow(x2, y2, 0, -arrow_length, head_width=0.2, head_length=0.2, 
-                    fc=self.dimension_color, ec=self.dimension_color)
+            lines.arrows.append(np.column_stack([x1 - uy, y1 + ux]))
+            lines.arrows.append(np.column_stack([x2 + uy, y2 - ux]))
         else:
             # Horizontal arrows
-            ax.arrow(x1, y1, arrow_length, 0, head_width=0.2, head_length=0.2, 
-                    fc=self.dimension_color, ec=self.dimension_color)
-            ax.arrow(x2, y2, -arrow_length, 0, head_width=0.2, head_length=0.2, 
-                    fc=self.dimension_color, ec=self.dimension_color)
+            lines.arrows.append(np.column_stack([x1 + ux, y1 + uy]))
+            lines.arrows.append(np.column_stack([x2 - ux, y2 - uy]))
     
     def _add_professional_title_block(self, ax, title: str, floor_plan: FloorPlan, 
                                     building_length: float, building_width: float, total_area: float):
@@ -311,85 +327,26 @@ class CADRenderer:
         ax.add_patch(title_rect)
         
         # Title text
-        ax.text(title_x + 7, title_y + 6.5, title, ha='center', va='center',
-               fontsize=self.title_fontsize, fontweight='bold', color=self.text_color)
+        ax.text(title_x + 7, title_y + 6.5, title, **self._title_kwargs)
         
         # Floor information
         floor_text = f"Ground Floor" if floor_plan.floor_number == 0 else f"Floor {floor_plan.floor_number + 1}"
-        ax.text(title_x + 7, title_y + 5.5, floor_text, ha='center', va='center',
-               fontsize=self.subtitle_fontsize, color=self.text_color)
+        ax.text(title_x + 7, title_y + 5.5, floor_text, **self._subtitle_kwargs)
         
         # Building dimensions
         ax.text(title_x + 7, title_y + 4.5, f"Building Size: {building_length:.1f}' × {building_width:.1f}'",
-               ha='center', va='center', fontsize=self.label_fontsize, color=self.text_color)
+               **self._spec_kwargs)
         
         # Total area
-        ax.text(title_x + 7, title_y + 3.5, f"Total Area: {total_area:.0f} sq.ft",
-               ha='center', va='center', fontsize=self.label_fontsize, color=self.text_color)
+        ax.text(title_x + 7, title_y + 3.5, f"Total Area: {total_area:.0f} sq.ft", **self._spec_kwargs)
         
         # Scale
-        ax.text(title_x + 7, title_y + 2.5, "Scale: 1\" = 1'", ha='center', va='center',
-               fontsize=self.label_fontsize, color=self.text_color)
+        ax.text(title_x + 7, title_y + 2.5, "Scale: 1\" = 1'", **self._spec_kwargs)
         
         # Date
-        from datetime import datetime
         date_str = datetime.now().strftime("%m/%d/%Y")
-        ax.text(title_x + 7, title_y + 1.5, f"Date: {date_str}", ha='center', va='center',
-               fontsize=self.area_fontsize, color=self.text_color)
+        ax.text(title_x + 7, title_y + 1.5, f"Date: {date_str}", **self._date_kwargs)
         
         # North arrow (top-left)
         north_x, north_y = 3, building_width + 3
         self._draw_north_arrow(ax, north_x, north_y)
-    
-    def _draw_north_arrow(self, ax, x: float, y: float):
-        """Draw professional north arrow."""
-        # Arrow shaft
-        ax.arrow(x, y, 0, 2, head_width=0.3, head_length=0.3, 
-                fc='black', ec='black', linewidth=2)
-        
-        # "N" label
-        ax.text(x, y + 2.8, 'N', ha='center', va='center', 
-               fontsize=self.label_fontsize, fontweight='bold')
-        
-        # Circle
-        circle = Circle((x, y + 1), 0.8, fill=False, edgecolor='black', linewidth=1.5)
-        ax.add_patch(circle)
-    
-    def _apply_professional_styling(self, ax, building_length: float, building_width: float):
-        """Apply professional architectural drawing styling."""
-        # Set limits with margins for dimensions
-        margin = 5
-        ax.set_xlim(-margin, building_length + margin)
-        ax.set_ylim(-margin, building_width + margin + 10)  # Extra space for title block
-        
-        # Equal aspect ratio
-        ax.set_aspect('equal')
-        
-        # Remove axes for clean look
-        ax.set_xticks([])
-        ax.set_yticks([])
-        
-        # Clean spines
-        for spine in ax.spines.values():
-            spine.set_visible(False)
-        
-        # White background
-        ax.set_facecolor('white')
-    
-    def _save_and_encode(self, fig, output_path: Optional[str]) -> str:
-        """Save figure and return base64 encoded string."""
-        # Save to file if path provided
-        if output_path:
-            fig.savefig(output_path, dpi=300, bbox_inches='tight', 
-                       facecolor='white', edgecolor='none', format='png')
-        
-        # Convert to base64 for web display
-        buffer = io.BytesIO()
-        fig.savefig(buffer, format='png', dpi=300, bbox_inches='tight',
-                   facecolor='white', edgecolor='none')
-        buffer.seek(0)
-        image_base64 = base64.b64encode(buffer.getvalue()).decode()
-        
-        plt.close(fig)
-        
-        return image_base64
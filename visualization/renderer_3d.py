@@ -5,14 +5,18 @@ Creates photorealistic 3D visualizations of architectural designs with interacti
 
 import plotly.graph_objects as go
 import plotly.express as px
+import plotly.io as pio
 from plotly.subplots import make_subplots
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Tuple, Optional, Any
+from typing import Callable, Dict, List, Tuple, Optional, Any
 import base64
 import io
 import json
 import math
+import threading
+import weakref
+from collections import OrderedDict
 
 # Set matplotlib backend for compatibility
 import matplotlib
@@ -24,10 +28,296 @@ current_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(current_dir))
 
 from architectural_engine.schemas import FloorPlan, RoomDimensions, ArchitecturalDesign
+from ._cad_base import njit, prange
+
+# Serialize figures with orjson when it is installed; it writes C-contiguous
+# numeric numpy arrays directly instead of converting them to Python lists
+try:
+    import orjson  # noqa: F401
+    pio.json.config.default_engine = 'orjson'
+except ImportError:
+    pass
+
+# Kaleido 0.x exposes a scope that keeps one Chromium subprocess alive
+# between exports; newer Kaleido only works through fig.to_image
+try:
+    from kaleido.scopes.plotly import PlotlyScope
+except ImportError:
+    PlotlyScope = None
+
+_scope = None
+_scope_lock = threading.Lock()  # the scope talks to its subprocess one request at a time
+
+def _to_png(fig) -> bytes:
+    """
+    Rasterize a figure, or a figure dict, to PNG through the shared Kaleido
+    scope when available.
+    """
+    global _scope
+    if PlotlyScope is None:
+        return pio.to_image(fig, format="png", width=1000, height=700, scale=2)
+    with _scope_lock:
+        if _scope is None:
+            _scope = PlotlyScope()
+        return _scope.transform(fig, format="png", width=1000, height=700, scale=2)
+
+# Unit box: bottom corners counter-clockwise from the origin, then the top
+# corners above them, and two triangles for each of the six sides
+_BOX_VERTS = np.array([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0],
+                       [0, 0, 1], [1, 0, 1], [1, 1, 1], [0, 1, 1]], dtype=np.float32)
+_BOX_FACES = np.array([[0, 1, 2], [0, 2, 3],   # bottom
+                       [4, 5, 6], [4, 6, 7],   # top
+                       [0, 1, 5], [0, 5, 4],   # front
+                       [1, 2, 6], [1, 6, 5],   # right
+                       [2, 3, 7], [2, 7, 6],   # back
+                       [3, 0, 4], [3, 4, 7]],  # left
+                      dtype=np.int32)
+
+def _box(origin, size) -> Tuple[np.ndarray, np.ndarray]:
+    """Axis-aligned box mesh as (vertices, faces) from its minimum corner and size."""
+    return _BOX_VERTS * np.asarray(size) + np.asarray(origin), _BOX_FACES
+
+# Compiled eagerly for C-contiguous float32 input, with the boxes split
+# across threads; each box writes only its own rows of the output
+@njit('Tuple((f4[:, ::1], i4[:, ::1]))(f4[:, ::1], f4[:, ::1])', parallel=True, cache=True)
+def _build_box_meshes(origins, sizes):
+    """
+    One mesh for n axis-aligned boxes from (n, 3) minimum corners and sizes:
+    (n * 8, 3) float32 vertices and (n * 12, 3) int32 faces, with each box's
+    face indices offset to its own vertices.
+    """
+    n = origins.shape[0]
+    verts = np.empty((n * 8, 3), np.float32)
+    faces = np.empty((n * 12, 3), np.int32)
+    for b in prange(n):
+        for v in range(8):
+            for axis in range(3):
+                verts[b * 8 + v, axis] = origins[b, axis] + _BOX_VERTS[v, axis] * sizes[b, axis]
+        for f in range(12):
+            for corner in range(3):
+                faces[b * 12 + f, corner] = _BOX_FACES[f, corner] + b * 8
+    return verts, faces
+
+def _wall_meshes(walls: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    One mesh for n straight walls given as (n, 7) rows of (x1, y1, x2, y2,
+    z0, z1, thickness): each wall is a box centred on its line, and
+    zero-length walls are left out.
+    """
+    start, end = walls[:, 0:2], walls[:, 2:4]
+    lengths = np.linalg.norm(end - start, axis=1)
+    keep = lengths > 0
+    walls, start, end = walls[keep], start[keep], end[keep]
+    
+    # Half-thickness offset perpendicular to each wall's direction
+    direction = (end - start) / lengths[keep, None]
+    offset = np.column_stack([-direction[:, 1], direction[:, 0]]) * (walls[:, 6:7] / 2)
+    
+    # Footprint corners in unit-box order, at the bottom and at the top, so
+    # the box faces apply unchanged
+    footprint = np.stack([start + offset, end + offset, end - offset, start - offset], axis=1)
+    n = len(walls)
+    verts = np.empty((n, 8, 3))
+    verts[:, :4, :2] = verts[:, 4:, :2] = footprint
+    verts[:, :4, 2] = walls[:, 4:5]
+    verts[:, 4:, 2] = walls[:, 5:6]
+    faces = _BOX_FACES + 8 * np.arange(n, dtype=np.int32)[:, None, None]
+    return verts.reshape(-1, 3), faces.reshape(-1, 3)
+
+def _box_arrays(boxes: List[tuple]) -> Tuple[np.ndarray, np.ndarray]:
+    """(n, 3) float32 minimum corners and sizes for _build_box_meshes from (origin, size) boxes."""
+    origins, sizes = np.array(boxes, dtype=np.float32).transpose(1, 0, 2)
+    return np.ascontiguousarray(origins), np.ascontiguousarray(sizes)
+
+@njit(cache=True)
+def _append_rect(out, count, box, axis, plane, u0, u1, v0, v1):
+    """Write one _skin_box_faces rectangle at row count, doubling out when full."""
+    if count == out.shape[0]:
+        grown = np.empty((2 * out.shape[0], 7), np.float64)
+        grown[:count] = out[:count]
+        out = grown
+    out[count, 0] = box
+    out[count, 1] = axis
+    out[count, 2] = plane
+    out[count, 3] = u0
+    out[count, 4] = u1
+    out[count, 5] = v0
+    out[count, 6] = v1
+    return out, count + 1
+
+@njit(cache=True)
+def _skin_box_faces(origins, sizes):
+    """
+    Face rectangles for n axis-aligned boxes from (n, 3) minimum corners and
+    sizes, drawing each shared wall once: where a box's low face on some axis
+    lies against another box's high face, the covered part is left out and
+    only the neighbour's face remains there.
+    
+    Returns an (m, 7) array of rectangles as (box, axis, plane, u0, u1, v0, v1),
+    with the face lying at `plane` on `axis` and spanning u0..u1 and v0..v1 on
+    the next two axes in cyclic order.
+    """
+    eps = 1e-4
+    n = origins.shape[0]
+    lo = origins.astype(np.float64)
+    hi = (origins + sizes).astype(np.float64)  # far corners in the input precision
+    
+    # Per axis, boxes sorted by the plane of their high face, so the faces
+    # lying on a given plane are one slice found by binary search
+    orders = np.empty((3, n), np.intp)
+    high_planes = np.empty((3, n), np.float64)
+    for axis in range(3):
+        orders[axis] = np.argsort(hi[:, axis])
+        high_planes[axis] = hi[orders[axis], axis]
+    
+    out = np.empty((max(8 * n, 1), 7), np.float64)
+    count = 0
+    for b in range(n):
+        for axis in range(3):
+            u = (axis + 1) % 3
+            v = (axis + 2) % 3
+            order = orders[axis]
+            u0, u1 = lo[b, u], hi[b, u]
+            v0, v1 = lo[b, v], hi[b, v]
+            
+            # High face, always drawn
+            out, count = _append_rect(out, count, b, axis, hi[b, axis], u0, u1, v0, v1)
+            
+            # Parts of the low face covered by other boxes' high faces on the same plane
+            plane = lo[b, axis]
+            first = np.searchsorted(high_planes[axis], plane - eps, side='right')
+            last = np.searchsorted(high_planes[axis], plane + eps)
+            cover = np.empty((last - first, 4), np.float64)
+            k = 0
+            for s in range(first, last):
+                c = order[s]
+                if c == b:
+                    continue
+                cu0 = max(u0, lo[c, u])
+                cu1 = min(u1, hi[c, u])
+                cv0 = max(v0, lo[c, v])
+                cv1 = min(v1, hi[c, v])
+                if cu1 - cu0 > eps and cv1 - cv0 > eps:
+                    cover[k, 0] = cu0
+                    cover[k, 1] = cu1
+                    cover[k, 2] = cv0
+                    cover[k, 3] = cv1
+                    k += 1
+            if k == 0:
+                out, count = _append_rect(out, count, b, axis, plane, u0, u1, v0, v1)
+                continue
+            
+            # Split the low face along every cover edge and keep the uncovered cells
+            us = np.empty(2 * k + 2, np.float64)
+            vs = np.empty(2 * k + 2, np.float64)
+            us[0], us[1] = u0, u1
+            vs[0], vs[1] = v0, v1
+            us[2:] = cover[:k, 0:2].ravel()
+            vs[2:] = cover[:k, 2:4].ravel()
+            us = np.unique(us)
+            vs = np.unique(vs)
+            for p in range(len(us) - 1):
+                if us[p + 1] - us[p] <= eps:
+                    continue
+                mid_u = (us[p] + us[p + 1]) / 2
+                for q in range(len(vs) - 1):
+                    if vs[q + 1] - vs[q] <= eps:
+                        continue
+                    mid_v = (vs[q] + vs[q + 1]) / 2
+                    covered = False
+                    for r in range(k):
+                        if cover[r, 0] < mid_u < cover[r, 1] and cover[r, 2] < mid_v < cover[r, 3]:
+                            covered = True
+                            break
+                    if not covered:
+                        out, count = _append_rect(out, count, b, axis, plane, us[p], us[p + 1], vs[q], vs[q + 1])
+    return out[:count].copy()
+
+def _rect_meshes(rects: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Mesh for _skin_box_faces rectangles: two triangles per rectangle, in
+    rectangle order, over corner vertices shared between rectangles.
+    """
+    m = len(rects)
+    rows = np.arange(m)[:, None]
+    corner = np.arange(4)
+    axis = rects[:, 1].astype(np.intp)[:, None]
+    
+    corners = np.empty((m, 4, 3))
+    corners[rows, corner, axis] = rects[:, [2, 2, 2, 2]]
+    corners[rows, corner, (axis + 1) % 3] = rects[:, [3, 4, 4, 3]]
+    corners[rows, corner, (axis + 2) % 3] = rects[:, [5, 5, 6, 6]]
+    
+    verts, inverse = np.unique(corners.reshape(-1, 3), axis=0, return_inverse=True)
+    quads = inverse.reshape(m, 4)
+    faces = np.stack([quads[:, [0, 1, 2]], quads[:, [0, 2, 3]]], axis=1).reshape(-1, 3)
+    return verts, faces
+
+def _rasterize_rects(origins: np.ndarray, sizes: np.ndarray, codes: np.ndarray,
+                     shape: Tuple[int, int], cells_per_foot: float) -> np.ndarray:
+    """
+    Paint axis-aligned rectangles onto an (ny, nx) grid of code 0, each cell
+    taking the code of the last rectangle covering its centre.
+    """
+    image = np.zeros(shape, dtype=np.int32)
+    lo = np.rint(origins[:, :2] * cells_per_foot).astype(np.intp)
+    hi = np.rint((origins[:, :2] + sizes[:, :2]) * cells_per_foot).astype(np.intp)
+    for (x0, y0), (x1, y1), code in zip(np.maximum(lo, 0), hi, codes):
+        image[y0:y1, x0:x1] = code
+    return image
+
+# Room name, position and size, one record per room
+_ROOM_DTYPE = np.dtype([('name', object), ('x', 'f8'), ('y', 'f8'), ('l', 'f8'), ('w', 'f8')])
+
+# _normalize_rooms results for live floor plans, by id(); each entry is
+# dropped when its FloorPlan is garbage collected
+_normalized_rooms: Dict[int, np.ndarray] = {}
+
+def _normalize_rooms(floor_plan: FloorPlan) -> np.ndarray:
+    """
+    A floor plan's rooms as a _ROOM_DTYPE array in dict order, built on first
+    use and reused after. Rooms may be RoomDimensions or plain dicts; missing
+    dict fields default to a 10 ft square at the origin.
+    """
+    key = id(floor_plan)
+    rooms = _normalized_rooms.get(key)
+    if rooms is None:
+        rooms = np.empty(len(floor_plan.rooms), dtype=_ROOM_DTYPE)
+        for r, (room_name, room_dims) in enumerate(floor_plan.rooms.items()):
+            if isinstance(room_dims, dict):
+                # Handle dictionary format
+                rooms[r] = (room_name, room_dims.get('x_position', 0), room_dims.get('y_position', 0),
+                            room_dims.get('length', 10), room_dims.get('width', 10))
+            else:
+                # Handle RoomDimensions object (default case)
+                rooms[r] = (room_name, room_dims.x_position, room_dims.y_position,
+                            room_dims.length, room_dims.width)
+        _normalized_rooms[key] = rooms
+        weakref.finalize(floor_plan, _normalized_rooms.pop, key, None)
+    return rooms
+
+def _mesh_arrays(mesh: Tuple[np.ndarray, np.ndarray]) -> dict:
+    """
+    Mesh3d coordinate and face-index arguments for a (vertices, faces) mesh,
+    as contiguous arrays so the JSON encoder can take them as they are.
+    Coordinates go out as float32 and indices as int32, half the size of
+    the float64/int64 numpy would otherwise default to.
+    """
+    verts, faces = mesh
+    x, y, z = np.ascontiguousarray(verts.T, dtype=np.float32)
+    i, j, k = np.ascontiguousarray(faces.T, dtype=np.int32)
+    return dict(x=x, y=y, z=z, i=i, j=j, k=k)
 
 class Renderer3D:
     """Professional 3D architectural renderer with photorealistic visualization."""
     
+    # Buildings with more rooms than this are drawn with flat, rasterized
+    # floor plans under detail_level='auto'
+    raster_room_threshold = 200
+    
+    # Resolution of the rasterized floor plans
+    raster_cells_per_foot = 2
+    
     def __init__(self):
         """Initialize 3D renderer with professional settings."""
         # Color schemes for different room types
@@ -59,15 +349,132 @@ class Renderer3D:
             'window': {'color': '#87CEEB', 'opacity': 0.3}
         }
         
+        # Furniture trace styles by kind of piece
+        self.furniture = {
+            'bed': {'color': '#8B4513', 'opacity': 0.7, 'name': "Bed"},
+            'sofa': {'color': '#4682B4', 'opacity': 0.7, 'name': "Sofa"},
+            'kitchen_counter': {'color': '#DAA520', 'opacity': 0.8, 'name': "Kitchen Counter"}
+        }
+        
         # Standard dimensions
         self.wall_thickness = 0.5  # feet
         self.floor_height = 10.0   # feet
         self.door_height = 7.0     # feet
         self.window_height = 4.0   # feet
         
+        # Walkthrough views, as Plotly scene cameras around the building
+        self._walkthrough_cameras = {
+            'front': dict(eye=dict(x=0, y=-2.2, z=0.6)),
+            'back': dict(eye=dict(x=0, y=2.2, z=0.6)),
+            'left': dict(eye=dict(x=-2.2, y=0, z=0.6)),
+            'right': dict(eye=dict(x=2.2, y=0, z=0.6)),
+            'top': dict(eye=dict(x=0, y=0, z=2.8), up=dict(x=0, y=1, z=0)),
+            'isometric': dict(eye=dict(x=1.5, y=1.5, z=1.2)),
+        }
+        
+        # Scene layout shared by every render; _scene_figure fills in
+        # the aspect ratio of the building being drawn
+        self._base_layout = go.Layout(
+            title={
+                'text': "Professional 3D Architectural Visualization",
+                'x': 0.5,
+                'xanchor': 'center',
+                'font': {'size': 20, 'color': '#2E86AB'}
+            },
+            scene=dict(
+                xaxis=dict(
+                    title="Length (feet)",
+                    showgrid=True,
+                    gridcolor='lightgray',
+                    showline=True,
+                    linecolor='gray'
+                ),
+                yaxis=dict(
+                    title="Width (feet)",
+                    showgrid=True,
+                    gridcolor='lightgray',
+                    showline=True,
+                    linecolor='gray'
+                ),
+                zaxis=dict(
+                    title="Height (feet)",
+                    showgrid=True,
+                    gridcolor='lightgray',
+                    showline=True,
+                    linecolor='gray'
+                ),
+                camera=dict(
+                    eye=dict(x=1.5, y=1.5, z=1.2),
+                    center=dict(x=0, y=0, z=0),
+                    up=dict(x=0, y=0, z=1)
+                ),
+                aspectmode='manual',
+                bgcolor='rgba(240, 248, 255, 0.8)'
+            ),
+            width=1000,
+            height=700,
+            margin=dict(l=0, r=0, t=50, b=0),
+            legend=dict(
+                orientation="v",
+                yanchor="top",
+                y=1,
+                xanchor="left",
+                x=1.02
+            )
+        )
+        
+        # Finished renders keyed on their inputs, least recently used first.
+        # Call invalidate_cache after changing any of the settings above.
+        self.render_cache_size = 64
+        self._render_cache = OrderedDict()
+        self._render_cache_lock = threading.Lock()
+        
+    def _warmup(self):
+        """
+        Do the one-off work of a first render up front: compile the geometry
+        kernels and load Plotly's validators for every trace type used.
+        """
+        origins = np.zeros((1, 3), np.float32)
+        sizes = np.ones((1, 3), np.float32)
+        _build_box_meshes(origins, sizes)
+        _rect_meshes(_skin_box_faces(origins, sizes))
+        go.Figure(data=[dict(type='mesh3d'), dict(type='scatter3d'), dict(type='surface')],
+                  layout=self._base_layout)
+    
+    def invalidate_cache(self):
+        """Forget all cached renders."""
+        with self._render_cache_lock:
+            self._render_cache.clear()
+    
+    def _cached_render(self, key: tuple, render: Callable[[], Any]) -> Any:
+        """Return the cached output for key, calling render and keeping its result on a miss."""
+        with self._render_cache_lock:
+            if key in self._render_cache:
+                self._render_cache.move_to_end(key)
+                return self._render_cache[key]
+        
+        result = render()
+        
+        with self._render_cache_lock:
+            self._render_cache[key] = result
+            while len(self._render_cache) > self.render_cache_size:
+                self._render_cache.popitem(last=False)
+        return result
+    
+    def _design_key(self, design: ArchitecturalDesign) -> tuple:
+        """The parts of a design that show up in a render, as a hashable key."""
+        return (design.input_parameters.model_dump_json(), design.setbacks.model_dump_json(),
+                design.space_efficiency.total_built_area)
+    
+    def _floor_key(self, floor_plan: FloorPlan) -> tuple:
+        """Floor number, overall size and room geometry of a floor plan, as a hashable key."""
+        rooms = tuple((room_name, tuple((room_dims if isinstance(room_dims, dict) else room_dims.model_dump()).items()))
+                      for room_name, room_dims in floor_plan.rooms.items())
+        return floor_plan.floor_number, tuple(floor_plan.total_dimensions.items()), rooms
+    
     def render_3d_building(self, design: ArchitecturalDesign, 
                           all_floor_plans: List[FloorPlan],
-                          view_mode: str = 'interactive') -> str:
+                          view_mode: str = 'interactive', detail_level: str = 'auto') -> str:
         """
         Render complete 3D building with all floors.
         
@@ -75,11 +482,40 @@ class Renderer3D:
             design: Complete architectural design
             all_floor_plans: List of floor plans for all floors
             view_mode: 'interactive', 'static', or 'export'
+            detail_level: 'full' draws every room as a 3D box; 'raster' draws
+                each floor as a flat image of its rooms inside the 3D walls;
+                'auto' picks 'raster' above raster_room_threshold rooms
             
         Returns:
-            str: Base64 encoded HTML or image data
+            str: HTML document ('interactive'), base64 encoded PNG ('static'),
+            or a dict of download formats ('export')
         """
-        fig = go.Figure()
+        if detail_level == 'auto':
+            room_count = sum(len(floor_plan.rooms) for floor_plan in all_floor_plans)
+            detail_level = 'raster' if room_count > self.raster_room_threshold else 'full'
+        rasterize = detail_level == 'raster'
+        
+        key = ('building', self._design_key(design),
+               tuple(self._floor_key(floor_plan) for floor_plan in all_floor_plans), view_mode, rasterize)
+        return self._cached_render(key, lambda: self._render_3d_building(design, all_floor_plans, view_mode,
+                                                                         rasterize))
+    
+    def _render_3d_building(self, design: ArchitecturalDesign, all_floor_plans: List[FloorPlan],
+                            view_mode: str, rasterize: bool = False):
+        """Build and export the building figure; see render_3d_building."""
+        fig = self._build_scene_figure(design, all_floor_plans, rasterize)
+        
+        if view_mode == 'interactive':
+            return self._export_interactive_html(fig, design)
+        elif view_mode == 'static':
+            return self._export_static_image(fig)
+        else:
+            return self._export_for_download(fig, design)
+    
+    def _build_scene_figure(self, design: ArchitecturalDesign, all_floor_plans: List[FloorPlan],
+                            rasterize: bool = False) -> go.Figure:
+        """Assemble the full building figure: every floor, the roof and the scene setup."""
+        traces = []
         
         # Calculate building dimensions
         setbacks = design.setbacks
@@ -87,37 +523,35 @@ class Renderer3D:
         building_length = land_side - setbacks.front - setbacks.rear
         building_width = land_side - setbacks.left - setbacks.right
         
-        # Render each floor
+        # Collect box meshes for every floor, grouped by material, so the
+        # whole building is drawn with one trace per group
+        slabs, rooms, walls = [], [], []
         for floor_idx, floor_plan in enumerate(all_floor_plans):
             floor_height_offset = floor_idx * self.floor_height
             
-            # Add floor slab
-            self._add_floor_slab(fig, building_length, building_width, 
-                               floor_height_offset, floor_idx)
+            # Floor slab
+            slabs.append(self._floor_slab_box(building_length, building_width, floor_height_offset))
             
-            # Add rooms for this floor
-            self._add_floor_rooms(fig, floor_plan, floor_height_offset, floor_idx)
+            # Rooms for this floor
+            rooms.append(self._floor_rooms(floor_plan, floor_height_offset, floor_idx))
             
-            # Add walls
-            self._add_exterior_walls(fig, building_length, building_width, 
-                                   floor_height_offset, floor_idx)
+            # Walls
+            walls.append(self._walls_from_footprint(building_length, building_width, floor_height_offset,
+                                                    self.floor_height))
+        
+        self._add_structure_traces(traces, slabs, rooms, walls, rasterize)
         
         # Add roof
         total_height = len(all_floor_plans) * self.floor_height
-        self._add_roof(fig, building_length, building_width, total_height)
+        self._add_roof(traces, building_length, building_width, total_height)
         
         # Configure 3D scene
-        self._configure_3d_scene(fig, building_length, building_width, total_height)
+        fig = self._scene_figure(traces, building_length, building_width, total_height)
         
         # Add professional lighting and camera
         self._add_professional_lighting(fig)
         
-        if view_mode == 'interactive':
-            return self._export_interactive_html(fig, design)
-        elif view_mode == 'static':
-            return self._export_static_image(fig)
-        else:
-            return self._export_for_download(fig, design)
+        return fig
     
     def render_floor_3d(self, floor_plan: FloorPlan, floor_number: int = 0,
                        show_furniture: bool = True) -> str:
@@ -130,9 +564,14 @@ class Renderer3D:
             show_furniture: Whether to show basic furniture
             
         Returns:
-            str: Base64 encoded HTML data
+            str: HTML document
         """
-        fig = go.Figure()
+        key = ('floor', self._floor_key(floor_plan), floor_number, show_furniture)
+        return self._cached_render(key, lambda: self._render_floor_3d(floor_plan, floor_number, show_furniture))
+    
+    def _render_floor_3d(self, floor_plan: FloorPlan, floor_number: int, show_furniture: bool) -> str:
+        """Build and export the single-floor figure; see render_floor_3d."""
+        traces = []
         
         # Calculate floor dimensions
         total_dims = floor_plan.total_dimensions
@@ -141,353 +580,232 @@ class Renderer3D:
         
         floor_height_offset = floor_number * self.floor_height
         
-        # Add floor slab
-        self._add_floor_slab(fig, building_length, building_width, 
-                           floor_height_offset, floor_number)
-        
-        # Add rooms
-        self._add_floor_rooms(fig, floor_plan, floor_height_offset, floor_number)
-        
-        # Add exterior walls
-        self._add_exterior_walls(fig, building_length, building_width, 
-                               floor_height_offset, floor_number)
+        # Floor slab, rooms and exterior walls, one trace per material
+        self._add_structure_traces(
+            traces,
+            [self._floor_slab_box(building_length, building_width, floor_height_offset)],
+            [self._floor_rooms(floor_plan, floor_height_offset, floor_number)],
+            [self._walls_from_footprint(building_length, building_width, floor_height_offset,
+                                        self.floor_height)])
         
         # Add furniture if requested
         if show_furniture:
-            self._add_basic_furniture(fig, floor_plan, floor_height_offset)
+            self._add_basic_furniture(traces, floor_plan, floor_height_offset)
         
         # Configure scene
-        self._configure_3d_scene(fig, building_length, building_width, self.floor_height)
+        fig = self._scene_figure(traces, building_length, building_width, self.floor_height)
         self._add_professional_lighting(fig)
         
         return self._export_interactive_html(fig, None, f"Floor {floor_number + 1}")
     
-    def _add_floor_slab(self, fig: go.Figure, length: float, width: float, 
-                       height_offset: float, floor_number: int):
-        """Add floor slab (concrete base)."""
-        # Floor slab vertices
-        x = [0, length, length, 0, 0, length, length, 0]
-        y = [0, 0, width, width, 0, 0, width, width]
-        z = [height_offset, height_offset, height_offset, height_offset,
-             height_offset + 0.5, height_offset + 0.5, height_offset + 0.5, height_offset + 0.5]
-        
-        # Floor slab faces
-        i = [0, 1, 2, 3, 4, 5, 6, 7, 0, 1, 2, 3]
-        j = [1, 2, 3, 0, 5, 6, 7, 4, 4, 5, 6, 7]
-        k = [2, 3, 0, 1, 6, 7, 4, 5, 1, 2, 3, 0]
-        
-        floor_name = f"Floor {floor_number + 1} Slab"
-        
-        fig.add_trace(go.Mesh3d(
-            x=x, y=y, z=z,
-            i=i, j=j, k=k,
-            color=self.materials['floor']['color'],
-            opacity=self.materials['floor']['opacity'],
-            name=floor_name,
-            showlegend=True
+    def _add_structure_traces(self, traces: List[dict], slabs: List[tuple],
+                              rooms: List[tuple], walls: List[np.ndarray], rasterize: bool = False):
+        """
+        Add floor slabs, rooms and walls as one Mesh3d trace each.
+        
+        Slabs are (origin, size) boxes. Rooms come as one (origins, sizes,
+        colors, hover texts) entry per floor and are drawn as a skin, with
+        walls shared by neighbouring rooms drawn once. Their colors become
+        per-face colors of the shared trace; the hover text moves to a light
+        marker trace with one point at the middle of each room.
+        
+        With rasterize, slabs and rooms are replaced by one flat Surface per
+        floor showing its rooms' colors, which keeps very large buildings
+        light to draw; the walls and room tooltips stay as they are.
+        """
+        origins = np.concatenate([floor_rooms[0] for floor_rooms in rooms])
+        sizes = np.concatenate([floor_rooms[1] for floor_rooms in rooms])
+        
+        if rasterize:
+            for slab, floor_rooms in zip(slabs, rooms):
+                traces.append(self._floor_surface(slab, floor_rooms))
+        else:
+            traces.append(dict(
+                type='mesh3d',
+                **_mesh_arrays(_build_box_meshes(*_box_arrays(slabs))),
+                color=self.materials['floor']['color'],
+                opacity=self.materials['floor']['opacity'],
+                name="Floor Slabs",
+                showlegend=True
+            ))
+        
+        if len(origins):
+            colors = [color for floor_rooms in rooms for color in floor_rooms[2]]
+            texts = [text for floor_rooms in rooms for text in floor_rooms[3]]
+            if not rasterize:
+                rects = _skin_box_faces(origins, sizes)
+                traces.append(dict(
+                    type='mesh3d',
+                    **_mesh_arrays(_rect_meshes(rects)),
+                    facecolor=[colors[int(box)] for box in rects[:, 0] for _ in range(2)],
+                    opacity=0.6,
+                    name="Rooms",
+                    showlegend=True,
+                    hoverinfo='skip'
+                ))
+            
+            # Room tooltips, anchored at each box's centre
+            center_x, center_y, center_z = np.ascontiguousarray((origins + sizes / 2).T)
+            traces.append(dict(
+                type='scatter3d',
+                x=center_x, y=center_y, z=center_z,
+                mode='markers',
+                marker=dict(size=3, color=colors),
+                text=texts,
+                name="Room Info",
+                showlegend=False,
+                hovertemplate="%{text}<extra></extra>"
+            ))
+        
+        traces.append(dict(
+            type='mesh3d',
+            **_mesh_arrays(_wall_meshes(np.concatenate(walls))),
+            color=self.materials['wall']['color'],
+            opacity=self.materials['wall']['opacity'],
+            name="Exterior Walls",
+            showlegend=False
         ))
     
-    def _add_floor_rooms(self, fig: go.Figure, floor_plan: FloorPlan, 
-                        height_offset: float, floor_number: int):
-        """Add individual rooms as 3D spaces."""
-        for room_name, room_dims in floor_plan.rooms.items():
-            if isinstance(room_dims, dict):
-                # Handle dictionary format
-                length = room_dims.get('length', 10)
-                width = room_dims.get('width', 10)
-                x_pos = room_dims.get('x_position', 0)
-                y_pos = room_dims.get('y_position', 0)
-            else:
-                # Handle RoomDimensions object (default case)
-                length = getattr(room_dims, 'length', 10)
-                width = getattr(room_dims, 'width', 10)
-                x_pos = getattr(room_dims, 'x_position', 0)
-                y_pos = getattr(room_dims, 'y_position', 0)
-            
+    def _floor_surface(self, slab: tuple, floor_rooms: tuple) -> dict:
+        """
+        A floor as a flat Surface at slab top, colored by the room covering
+        each cell of a raster_cells_per_foot grid and floor color elsewhere.
+        """
+        (x0, y0, z0), (length, width, thickness) = slab
+        origins, sizes, colors = floor_rooms[:3]
+        cells = self.raster_cells_per_foot
+        shape = (max(int(math.ceil(width * cells)), 1), max(int(math.ceil(length * cells)), 1))
+        
+        # Code 0 is the bare floor; each distinct room color gets the next code
+        palette = [self.materials['floor']['color']] + list(dict.fromkeys(colors))
+        codes = np.array([palette.index(color) for color in colors], dtype=np.int32)
+        image = _rasterize_rects(origins, sizes, codes, shape, cells)
+        
+        # A stepped colorscale so each integer code maps to exactly one color
+        n = len(palette)
+        colorscale = [[(c + edge) / n, color] for c, color in enumerate(palette) for edge in (0, 1)]
+        return dict(
+            type='surface',
+            x=(x0 + (np.arange(shape[1], dtype=np.float32) + 0.5) / cells),
+            y=(y0 + (np.arange(shape[0], dtype=np.float32) + 0.5) / cells),
+            z=np.full(shape, z0 + thickness, dtype=np.float32),
+            surfacecolor=image,
+            colorscale=colorscale,
+            cmin=-0.5,
+            cmax=n - 0.5,
+            showscale=False,
+            opacity=self.materials['floor']['opacity'],
+            name="Floor Plan",
+            showlegend=False,
+            hoverinfo='skip'
+        )
+    
+    def _floor_slab_box(self, length: float, width: float, height_offset: float) -> tuple:
+        """Floor slab (concrete base) as an (origin, size) box."""
+        return (0, 0, height_offset), (length, width, 0.5)
+    
+    def _floor_rooms(self, floor_plan: FloorPlan, height_offset: float,
+                     floor_number: int) -> Tuple[np.ndarray, np.ndarray, List[str], List[str]]:
+        """
+        Room boxes for one floor, from the top of the slab to the ceiling:
+        (n, 3) minimum corners and sizes, plus each room's color and hover text.
+        """
+        rooms = _normalize_rooms(floor_plan)
+        origins = np.column_stack([rooms['x'], rooms['y'], np.full(len(rooms), height_offset + 0.5)])
+        sizes = np.column_stack([rooms['l'], rooms['w'], np.full(len(rooms), self.floor_height - 0.5)])
+        
+        colors, texts = [], []
+        for room_name, length, width in zip(rooms['name'], rooms['l'], rooms['w']):
             # Get room color
             room_color = self.room_colors.get(room_name.lower(), '#87CEEB')
             
-            # Create room box
-            self._add_room_box(fig, x_pos, y_pos, length, width, 
-                             height_offset, room_color, room_name, floor_number)
-    
-    def _add_room_box(self, fig: go.Figure, x_pos: float, y_pos: float,
-                     length: float, width: float, height_offset: float,
-                     color: str, room_name: str, floor_number: int):
-        """Add a single room as a 3D box."""
-        # Room vertices
-        x = [x_pos, x_pos + length, x_pos + length, x_pos,
-             x_pos, x_pos + length, x_pos + length, x_pos]
-        y = [y_pos, y_pos, y_pos + width, y_pos + width,
-             y_pos, y_pos, y_pos + width, y_pos + width]
-        z = [height_offset + 0.5, height_offset + 0.5, height_offset + 0.5, height_offset + 0.5,
-             height_offset + self.floor_height, height_offset + self.floor_height, 
-             height_offset + self.floor_height, height_offset + self.floor_height]
-        
-        # Room faces
-        i = [0, 1, 2, 3, 4, 5, 6, 7, 0, 1, 2, 3]
-        j = [1, 2, 3, 0, 5, 6, 7, 4, 4, 5, 6, 7]
-        k = [2, 3, 0, 1, 6, 7, 4, 5, 1, 2, 3, 0]
-        
-        display_name = f"{room_name.replace('_', ' ').title()} (Floor {floor_number + 1})"
-        
-        fig.add_trace(go.Mesh3d(
-            x=x, y=y, z=z,
-            i=i, j=j, k=k,
-            color=color,
-            opacity=0.6,
-            name=display_name,
-            showlegend=True,
-            hovertemplate=f"<b>{display_name}</b><br>" +
-                         f"Size: {length:.1f}' × {width:.1f}'<br>" +
-                         f"Area: {length * width:.0f} sq.ft<extra></extra>"
-        ))
+            display_name = f"{room_name.replace('_', ' ').title()} (Floor {floor_number + 1})"
+            hover_text = (f"<b>{display_name}</b><br>" +
+                          f"Size: {length:.1f}' × {width:.1f}'<br>" +
+                          f"Area: {length * width:.0f} sq.ft")
+            
+            colors.append(room_color)
+            texts.append(hover_text)
+        return origins.astype(np.float32), sizes.astype(np.float32), colors, texts
     
-    def _add_exterior_walls(self, fig: go.Figure, length: float, width: float,
-                          height_offset: float, floor_number: int):
-        """Add exterior walls."""
-        wall_height = self.floor_height
-        
-        # Front wall
-        self._add_wall(fig, 0, 0, length, 0, height_offset, wall_height, 
-                      f"Front Wall (Floor {floor_number + 1})")
-        
-        # Back wall
-        self._add_wall(fig, 0, width, length, width, height_offset, wall_height,
-                      f"Back Wall (Floor {floor_number + 1})")
-        
-        # Left wall
-        self._add_wall(fig, 0, 0, 0, width, height_offset, wall_height,
-                      f"Left Wall (Floor {floor_number + 1})")
-        
-        # Right wall
-        self._add_wall(fig, length, 0, length, width, height_offset, wall_height,
-                      f"Right Wall (Floor {floor_number + 1})")
-    
-    def _add_wall(self, fig: go.Figure, x1: float, y1: float, x2: float, y2: float,
-                 height_offset: float, wall_height: float, name: str):
-        """Add a single wall."""
-        thickness = self.wall_thickness
-        
-        # Calculate wall direction
-        dx = x2 - x1
-        dy = y2 - y1
-        length = math.sqrt(dx*dx + dy*dy)
-        
-        if length == 0:
-            return
-        
-        # Normalize direction
-        dx /= length
-        dy /= length
-        
-        # Perpendicular direction for thickness
-        px = -dy * thickness / 2
-        py = dx * thickness / 2
-        
-        # Wall vertices
-        x = [x1 + px, x2 + px, x2 - px, x1 - px,
-             x1 + px, x2 + px, x2 - px, x1 - px]
-        y = [y1 + py, y2 + py, y2 - py, y1 - py,
-             y1 + py, y2 + py, y2 - py, y1 - py]
-        z = [height_offset + 0.5, height_offset + 0.5, height_offset + 0.5, height_offset + 0.5,
-             height_offset + wall_height, height_offset + wall_height, 
-             height_offset + wall_height, height_offset + wall_height]
-        
-        # Wall faces
-        i = [0, 1, 2, 3, 4, 5, 6, 7, 0, 1, 2, 3]
-        j = [1, 2, 3, 0, 5, 6, 7, 4, 4, 5, 6, 7]
-        k = [2, 3, 0, 1, 6, 7, 4, 5, 1, 2, 3, 0]
-        
-        fig.add_trace(go.Mesh3d(
-            x=x, y=y, z=z,
-            i=i, j=j, k=k,
-            color=self.materials['wall']['color'],
-            opacity=self.materials['wall']['opacity'],
-            name=name,
-            showlegend=False
-        ))
+    def _walls_from_footprint(self, length: float, width: float, height_offset: float,
+                              wall_height: float) -> np.ndarray:
+        """
+        Exterior walls along the building footprint as a (4, 7) array of
+        (x1, y1, x2, y2, z0, z1, thickness) rows, from slab top to wall height.
+        """
+        z0, z1 = height_offset + 0.5, height_offset + wall_height
+        return np.array([
+            (0, 0, length, 0, z0, z1, self.wall_thickness),           # Front wall
+            (0, width, length, width, z0, z1, self.wall_thickness),   # Back wall
+            (0, 0, 0, width, z0, z1, self.wall_thickness),            # Left wall
+            (length, 0, length, width, z0, z1, self.wall_thickness),  # Right wall
+        ], dtype=np.float64)
     
-    def _add_roof(self, fig: go.Figure, length: float, width: float, total_height: float):
+    def _add_roof(self, traces: List[dict], length: float, width: float, total_height: float):
         """Add roof structure."""
         roof_thickness = 0.5
         
-        # Roof vertices
-        x = [0, length, length, 0, 0, length, length, 0]
-        y = [0, 0, width, width, 0, 0, width, width]
-        z = [total_height, total_height, total_height, total_height,
-             total_height + roof_thickness, total_height + roof_thickness, 
-             total_height + roof_thickness, total_height + roof_thickness]
-        
-        # Roof faces
-        i = [0, 1, 2, 3, 4, 5, 6, 7, 0, 1, 2, 3]
-        j = [1, 2, 3, 0, 5, 6, 7, 4, 4, 5, 6, 7]
-        k = [2, 3, 0, 1, 6, 7, 4, 5, 1, 2, 3, 0]
-        
-        fig.add_trace(go.Mesh3d(
-            x=x, y=y, z=z,
-            i=i, j=j, k=k,
+        traces.append(dict(
+            type='mesh3d',
+            **_mesh_arrays(_box((0, 0, total_height), (length, width, roof_thickness))),
             color='#8B4513',  # Brown roof
             opacity=0.8,
             name="Roof",
             showlegend=True
         ))
     
-    def _add_basic_furniture(self, fig: go.Figure, floor_plan: FloorPlan, 
+    def _add_basic_furniture(self, traces: List[dict], floor_plan: FloorPlan, 
                            height_offset: float):
-        """Add basic furniture to rooms."""
-        for room_name, room_dims in floor_plan.rooms.items():
-            if isinstance(room_dims, dict):
-                length = room_dims.get('length', 10)
-                width = room_dims.get('width', 10)
-                x_pos = room_dims.get('x_position', 0)
-                y_pos = room_dims.get('y_position', 0)
-            else:
-                length = room_dims.length
-                width = room_dims.width
-                x_pos = room_dims.x_position
-                y_pos = room_dims.y_position
-            
+        """Add basic furniture to rooms, with all pieces of a kind in one trace."""
+        placements = {kind: [] for kind in self.furniture}
+        rooms = _normalize_rooms(floor_plan)
+        for room_name, x_pos, y_pos, length in zip(rooms['name'], rooms['x'], rooms['y'], rooms['l']):
             # Add furniture based on room type
             if 'bedroom' in room_name.lower():
-                self._add_bed(fig, x_pos + 1, y_pos + 1, height_offset)
+                placements['bed'].append(self._bed_box(x_pos + 1, y_pos + 1, height_offset))
             elif 'living' in room_name.lower():
-                self._add_sofa(fig, x_pos + 2, y_pos + 2, height_offset)
+                placements['sofa'].append(self._sofa_box(x_pos + 2, y_pos + 2, height_offset))
             elif 'kitchen' in room_name.lower():
-                self._add_kitchen_counter(fig, x_pos + 0.5, y_pos + 0.5, 
-                                        min(length - 1, 6), height_offset)
+                placements['kitchen_counter'].append(
+                    self._kitchen_counter_box(x_pos + 0.5, y_pos + 0.5, min(length - 1, 6), height_offset))
+        
+        for kind, boxes in placements.items():
+            if boxes:
+                traces.append(dict(
+                    type='mesh3d',
+                    **_mesh_arrays(_build_box_meshes(*_box_arrays(boxes))),
+                    **self.furniture[kind],
+                    showlegend=False
+                ))
     
-    def _add_bed(self, fig: go.Figure, x_pos: float, y_pos: float, height_offset: float):
-        """Add a bed to the room."""
+    def _bed_box(self, x_pos: float, y_pos: float, height_offset: float) -> tuple:
+        """A bed as an (origin, size) box."""
         bed_length, bed_width, bed_height = 6, 4, 2
-        
-        x = [x_pos, x_pos + bed_length, x_pos + bed_length, x_pos,
-             x_pos, x_pos + bed_length, x_pos + bed_length, x_pos]
-        y = [y_pos, y_pos, y_pos + bed_width, y_pos + bed_width,
-             y_pos, y_pos, y_pos + bed_width, y_pos + bed_width]
-        z = [height_offset + 0.5, height_offset + 0.5, height_offset + 0.5, height_offset + 0.5,
-             height_offset + bed_height, height_offset + bed_height, 
-             height_offset + bed_height, height_offset + bed_height]
-        
-        i = [0, 1, 2, 3, 4, 5, 6, 7, 0, 1, 2, 3]
-        j = [1, 2, 3, 0, 5, 6, 7, 4, 4, 5, 6, 7]
-        k = [2, 3, 0, 1, 6, 7, 4, 5, 1, 2, 3, 0]
-        
-        fig.add_trace(go.Mesh3d(
-            x=x, y=y, z=z,
-            i=i, j=j, k=k,
-            color='#8B4513',
-            opacity=0.7,
-            name="Bed",
-            showlegend=False
-        ))
+        return (x_pos, y_pos, height_offset + 0.5), (bed_length, bed_width, bed_height - 0.5)
     
-    def _add_sofa(self, fig: go.Figure, x_pos: float, y_pos: float, height_offset: float):
-        """Add a sofa to the room."""
+    def _sofa_box(self, x_pos: float, y_pos: float, height_offset: float) -> tuple:
+        """A sofa as an (origin, size) box."""
         sofa_length, sofa_width, sofa_height = 5, 2, 2.5
-        
-        x = [x_pos, x_pos + sofa_length, x_pos + sofa_length, x_pos,
-             x_pos, x_pos + sofa_length, x_pos + sofa_length, x_pos]
-        y = [y_pos, y_pos, y_pos + sofa_width, y_pos + sofa_width,
-             y_pos, y_pos, y_pos + sofa_width, y_pos + sofa_width]
-        z = [height_offset + 0.5, height_offset + 0.5, height_offset + 0.5, height_offset + 0.5,
-             height_offset + sofa_height, height_offset + sofa_height, 
-             height_offset + sofa_height, height_offset + sofa_height]
-        
-        i = [0, 1, 2, 3, 4, 5, 6, 7, 0, 1, 2, 3]
-        j = [1, 2, 3, 0, 5, 6, 7, 4, 4, 5, 6, 7]
-        k = [2, 3, 0, 1, 6, 7, 4, 5, 1, 2, 3, 0]
-        
-        fig.add_trace(go.Mesh3d(
-            x=x, y=y, z=z,
-            i=i, j=j, k=k,
-            color='#4682B4',
-            opacity=0.7,
-            name="Sofa",
-            showlegend=False
-        ))
+        return (x_pos, y_pos, height_offset + 0.5), (sofa_length, sofa_width, sofa_height - 0.5)
     
-    def _add_kitchen_counter(self, fig: go.Figure, x_pos: float, y_pos: float,
-                           counter_length: float, height_offset: float):
-        """Add kitchen counter."""
+    def _kitchen_counter_box(self, x_pos: float, y_pos: float,
+                             counter_length: float, height_offset: float) -> tuple:
+        """A kitchen counter as an (origin, size) box."""
         counter_width, counter_height = 2, 3
-        
-        x = [x_pos, x_pos + counter_length, x_pos + counter_length, x_pos,
-             x_pos, x_pos + counter_length, x_pos + counter_length, x_pos]
-        y = [y_pos, y_pos, y_pos + counter_width, y_pos + counter_width,
-             y_pos, y_pos, y_pos + counter_width, y_pos + counter_width]
-        z = [height_offset + 0.5, height_offset + 0.5, height_offset + 0.5, height_offset + 0.5,
-             height_offset + counter_height, height_offset + counter_height, 
-             height_offset + counter_height, height_offset + counter_height]
-        
-        i = [0, 1, 2, 3, 4, 5, 6, 7, 0, 1, 2, 3]
-        j = [1, 2, 3, 0, 5, 6, 7, 4, 4, 5, 6, 7]
-        k = [2, 3, 0, 1, 6, 7, 4, 5, 1, 2, 3, 0]
-        
-        fig.add_trace(go.Mesh3d(
-            x=x, y=y, z=z,
-            i=i, j=j, k=k,
-            color='#DAA520',
-            opacity=0.8,
-            name="Kitchen Counter",
-            showlegend=False
-        ))
+        return (x_pos, y_pos, height_offset + 0.5), (counter_length, counter_width, counter_height - 0.5)
     
-    def _configure_3d_scene(self, fig: go.Figure, length: float, width: float, height: float):
-        """Configure 3D scene with professional camera and lighting."""
-        # Calculate optimal camera position
-        max_dim = max(length, width, height)
-        camera_distance = max_dim * 1.5
+    def _scene_figure(self, traces: List[dict], length: float, width: float, height: float) -> go.Figure:
+        """
+        Figure of the given traces in the professional 3D scene.
         
-        fig.update_layout(
-            title={
-                'text': "Professional 3D Architectural Visualization",
-                'x': 0.5,
-                'xanchor': 'center',
-                'font': {'size': 20, 'color': '#2E86AB'}
-            },
-            scene=dict(
-                xaxis=dict(
-                    title="Length (feet)",
-                    showgrid=True,
-                    gridcolor='lightgray',
-                    showline=True,
-                    linecolor='gray'
-                ),
-                yaxis=dict(
-                    title="Width (feet)",
-                    showgrid=True,
-                    gridcolor='lightgray',
-                    showline=True,
-                    linecolor='gray'
-                ),
-                zaxis=dict(
-                    title="Height (feet)",
-                    showgrid=True,
-                    gridcolor='lightgray',
-                    showline=True,
-                    linecolor='gray'
-                ),
-                camera=dict(
-                    eye=dict(x=1.5, y=1.5, z=1.2),
-                    center=dict(x=0, y=0, z=0),
-                    up=dict(x=0, y=0, z=1)
-                ),
-                aspectmode='manual',
-                aspectratio=dict(x=1, y=width/length, z=height/length),
-                bgcolor='rgba(240, 248, 255, 0.8)'
-            ),
-            width=1000,
-            height=700,
-            margin=dict(l=0, r=0, t=50, b=0),
-            legend=dict(
-                orientation="v",
-                yanchor="top",
-                y=1,
-                xanchor="left",
-                x=1.02
-            )
-        )
+        Traces are plain dicts, validated once as the figure is built rather
+        than once on construction and again on add_trace; the layout starts
+        from the shared base and only the aspect ratio follows the building.
+        """
+        fig = go.Figure(data=traces, layout=self._base_layout)
+        fig.layout.scene.aspectratio = dict(x=1, y=width/length, z=height/length)
+        return fig
     
     def _add_professional_lighting(self, fig: go.Figure):
         """Add professional lighting effects."""
@@ -496,8 +814,15 @@ class Renderer3D:
         pass
     
     def _export_interactive_html(self, fig: go.Figure, design: Optional[ArchitecturalDesign] = None,
-                                title: str = "3D Architectural Visualization") -> str:
-        """Export as interactive HTML."""
+                                title: str = "3D Architectural Visualization",
+                                encoding: str = 'raw', output_path: Optional[str] = None) -> str:
+        """
+        Export as interactive HTML.
+        
+        encoding picks the return value: 'raw' gives the HTML itself, 'base64'
+        gives it base64 encoded for embedding, and 'file' writes it to
+        output_path and gives back that path.
+        """
         # Add custom controls and information
         if design:
             building_info = f"""
@@ -513,8 +838,7 @@ class Renderer3D:
         else:
             building_info = ""
         
-        # Convert to HTML
-        html_str = fig.to_html(
+        html_options = dict(
             include_plotlyjs='cdn',
             config={
                 'displayModeBar': True,
@@ -530,15 +854,26 @@ class Renderer3D:
             }
         )
         
-        # Add building info overlay
-        html_str = html_str.replace('<body>', f'<body>{building_info}')
+        # Add building info overlay: Plotly runs this once the plot exists,
+        # rather than us searching the finished document for <body>
+        if building_info:
+            html_options['post_script'] = (
+                f"document.body.insertAdjacentHTML('afterbegin', {json.dumps(building_info)});")
+        
+        if encoding == 'file':
+            # Written straight to the file, without building the whole string first
+            fig.write_html(output_path, **html_options)
+            return output_path
         
-        # Encode to base64
-        return base64.b64encode(html_str.encode()).decode()
+        # Convert to HTML
+        html_str = fig.to_html(**html_options)
+        if encoding == 'base64':
+            return base64.b64encode(html_str.encode()).decode()
+        return html_str
     
-    def _export_static_image(self, fig: go.Figure) -> str:
-        """Export as static PNG image."""
-        img_bytes = fig.to_image(format="png", width=1000, height=700, scale=2)
+    def _export_static_image(self, fig) -> str:
+        """Export a figure, or figure dict, as static PNG image."""
+        img_bytes = _to_png(fig)
         return base64.b64encode(img_bytes).decode()
     
     def _export_for_download(self, fig: go.Figure, design: ArchitecturalDesign) -> Dict[str, str]:
@@ -551,7 +886,12 @@ class Renderer3D:
     
     def create_simple_3d_placeholder(self, design: ArchitecturalDesign) -> str:
         """Create a simple 3D placeholder when full rendering fails."""
-        fig = go.Figure()
+        return self._cached_render(('placeholder', self._design_key(design)),
+                                   lambda: self._create_simple_3d_placeholder(design))
+    
+    def _create_simple_3d_placeholder(self, design: ArchitecturalDesign) -> str:
+        """Build and export the placeholder figure; see create_simple_3d_placeholder."""
+        traces = []
         
         # Create a simple building outline
         setbacks = design.setbacks
@@ -561,18 +901,9 @@ class Renderer3D:
         building_height = design.input_parameters.floors * self.floor_height
         
         # Simple building box
-        x = [0, building_length, building_length, 0, 0, building_length, building_length, 0]
-        y = [0, 0, building_width, building_width, 0, 0, building_width, building_width]
-        z = [0, 0, 0, 0, building_height, building_height, building_height, building_height]
-        
-        # Building faces
-        i = [0, 1, 2, 3, 4, 5, 6, 7, 0, 1, 2, 3]
-        j = [1, 2, 3, 0, 5, 6, 7, 4, 4, 5, 6, 7]
-        k = [2, 3, 0, 1, 6, 7, 4, 5, 1, 2, 3, 0]
-        
-        fig.add_trace(go.Mesh3d(
-            x=x, y=y, z=z,
-            i=i, j=j, k=k,
+        traces.append(dict(
+            type='mesh3d',
+            **_mesh_arrays(_box((0, 0, 0), (building_length, building_width, building_height))),
             color='lightblue',
             opacity=0.7,
             name=f"{design.input_parameters.bedroom_config} Building",
@@ -580,7 +911,7 @@ class Renderer3D:
         ))
         
         # Configure scene
-        self._configure_3d_scene(fig, building_length, building_width, building_height)
+        fig = self._scene_figure(traces, building_length, building_width, building_height)
         
         # Add title
         fig.update_layout(
@@ -602,13 +933,12 @@ class Renderer3D:
                                  all_floor_plans: List[FloorPlan]) -> str:
         """Create virtual walkthrough with multiple camera angles."""
         # This would create an animated walkthrough
-        # For now, return multiple static views
-        views = []
-        
-        for angle in ['front', 'back', 'left', 'right', 'top', 'isometric']:
-            fig = go.Figure()
-            # Render building with specific camera angle
-            # ... (implementation would be similar to render_3d_building)
-            views.append(self._export_static_image(fig))
-        
-        return json.dumps(views)
+        # For now, return multiple static views. The scene is built once and
+        # only the camera differs between views; each view is a shallow copy
+        # of the figure dict. Exports share one Kaleido scope, so they run in turn.
+        base = self._build_scene_figure(design, all_floor_plans).to_dict()
+        scene = base['layout']['scene']
+        views = [dict(base, layout=dict(base['layout'], scene=dict(scene, camera=dict(scene['camera'], **camera))))
+                 for camera in self._walkthrough_cameras.values()]
+        
+        return json.dumps([self._export_static_image(view) for view in views])
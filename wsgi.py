@@ -1,17 +1,36 @@
 """
 WSGI entry point for production deployment.
+
+Serve with gunicorn --preload --workers N wsgi:application so the imports
+and renderer warmup below run once in the master and are shared with the
+forked workers.
 """
 
+# Pick the non-interactive backend before anything can import pyplot, so no
+# worker ever starts a GUI backend
+import matplotlib
+matplotlib.use('Agg', force=True)
+
 import os
 import sys
 from pathlib import Path
 
-# Add current directory to Python path
+# Add current directory to Python path, once even if this module is reloaded
 current_dir = Path(__file__).parent
-sys.path.insert(0, str(current_dir))
+if str(current_dir) not in sys.path:
+    sys.path.insert(0, str(current_dir))
 
 # Import the Flask app
-from app import app
+from app import app, renderer_3d
+
+# Compile the 3D geometry kernels and load Plotly's trace validators before
+# any worker forks, rather than on each worker's first request. A failure
+# here must not keep the server from starting; the work then happens on the
+# first 3D render, which has its own fallbacks.
+try:
+    renderer_3d._warmup()
+except Exception as e:
+    print(f"WARNING: 3D renderer warmup failed, continuing without it: {e}")
 
 # Configure for production
 app.config['ENV'] = 'production'